@@ -4,6 +4,9 @@
 #include <iostream>
 #include <thread>
 #include <chrono>
+#include <algorithm>
+#include <map>
+#include <vector>
 
 namespace vpn_manager {
 
@@ -55,6 +58,27 @@ void VpnRpcOperationProcessor::processRequest(const char* payload, size_t payloa
         // JSON parsing
         nlohmann::json root = nlohmann::json::parse(payload, payload + payload_len);
 
+        // JSON-RPC 2.0 batch: an array of requests answered with a single array
+        if (root.is_array()) {
+            if (root.empty()) {
+                // No request id can be determined, so JSON-RPC 2.0 answers with "id": null; the
+                // reply is published like batch replies so the caller is not left waiting for a timeout
+                nlohmann::json response = buildResponse("", false, "", "Empty batch request");
+                response["id"] = nullptr;
+                publishResponse(response.dump(), responseTopic_, &rpcClient_);
+                return;
+            }
+
+            if (verbose_) {
+                std::cout << "Processing RPC batch of " << root.size() << " requests" << std::endl;
+            }
+
+            auto context = createContext(root, "batch");
+            context->isBatch = true;
+            launchProcessingThread(context);
+            return;
+        }
+
         // JSON-RPC 2.0 validation
         if (!root.contains("jsonrpc") || root["jsonrpc"].get<std::string>() != "2.0") {
             std::cerr << "Invalid or missing JSON-RPC version" << std::endl;
@@ -165,6 +189,11 @@ void VpnRpcOperationProcessor::processOperationThreadStatic(std::shared_ptr<Requ
     // Wait for thread ID synchronization
     unsigned int threadId = context->threadIdFuture.get();
     
+    if (context->isBatch) {
+        processBatchStatic(context, threadId);
+        return;
+    }
+    
     // Extract context data safely
     const std::string& requestJson = context->requestJson;
     const std::string& transactionId = context->transactionId;
@@ -186,70 +215,8 @@ void VpnRpcOperationProcessor::processOperationThreadStatic(std::shared_ptr<Requ
         
         // Route to appropriate handler using processor instance
         nlohmann::json result;
-        bool success = true;
         std::string errorMessage;
-        
-        try {
-            // Map HTTP operation names to RPC method calls
-            if (method == "parse") {
-                result = processor->handleParse(paramsObj);
-            } else if (method == "add") {
-                result = processor->handleAdd(paramsObj);
-            } else if (method == "delete") {
-                result = processor->handleDelete(paramsObj);
-            } else if (method == "update") {
-                result = processor->handleUpdate(paramsObj);
-            } else if (method == "set_auto_routing") {
-                result = processor->handleSetAutoRouting(paramsObj);
-            } else if (method == "start") {
-                result = processor->handleStart(paramsObj);
-            } else if (method == "stop") {
-                result = processor->handleStop(paramsObj);
-            } else if (method == "restart") {
-                result = processor->handleRestart(paramsObj);
-            } else if (method == "enable") {
-                result = processor->handleEnable(paramsObj);
-            } else if (method == "disable") {
-                result = processor->handleDisable(paramsObj);
-            } else if (method == "status") {
-                result = processor->handleStatus(paramsObj);
-            } else if (method == "list") {
-                result = processor->handleList(paramsObj);
-            } else if (method == "stats") {
-                result = processor->handleStats(paramsObj);
-            } else if (method == "add-custom-route") {
-                result = processor->handleAddCustomRoute(paramsObj);
-            } else if (method == "update-custom-route") {
-                result = processor->handleUpdateCustomRoute(paramsObj);
-            } else if (method == "delete-custom-route") {
-                result = processor->handleDeleteCustomRoute(paramsObj);
-            } else if (method == "list-custom-routes") {
-                result = processor->handleListCustomRoutes(paramsObj);
-            } else if (method == "get-custom-route") {
-                result = processor->handleGetCustomRoute(paramsObj);
-            } else if (method == "get-instance-routes") {
-                result = processor->handleGetInstanceRoutes(paramsObj);
-            } else if (method == "add-instance-route") {
-                result = processor->handleAddInstanceRoute(paramsObj);
-            } else if (method == "delete-instance-route") {
-                result = processor->handleDeleteInstanceRoute(paramsObj);
-            } else if (method == "apply-instance-routes") {
-                result = processor->handleApplyInstanceRoutes(paramsObj);
-            } else if (method == "detect-instance-routes") {
-                result = processor->handleDetectInstanceRoutes(paramsObj);
-            } else if (method == "purge-cleanup") {
-                result = processor->handlePurgeCleanup(paramsObj);
-            } else {
-                success = false;
-                errorMessage = "Unknown method: " + method;
-            }
-        } catch (const std::exception& e) {
-            success = false;
-            errorMessage = std::string("Operation failed: ") + e.what();
-            if (verbose) {
-                std::cerr << "Operation error: " << e.what() << std::endl;
-            }
-        }
+        bool success = dispatchOperation(processor, method, paramsObj, result, errorMessage, verbose);
         
         // Send response based on execution result
         if (success) {
@@ -271,6 +238,200 @@ void VpnRpcOperationProcessor::processOperationThreadStatic(std::shared_ptr<Requ
     }
 }
 
+bool VpnRpcOperationProcessor::dispatchOperation(VpnRpcOperationProcessor* processor, const std::string& method,
+                                                 const nlohmann::json& paramsObj, nlohmann::json& result,
+                                                 std::string& errorMessage, bool verbose) {
+    bool success = true;
+    
+    try {
+        // Map HTTP operation names to RPC method calls
+        if (method == "parse") {
+            result = processor->handleParse(paramsObj);
+        } else if (method == "add") {
+            result = processor->handleAdd(paramsObj);
+        } else if (method == "delete") {
+            result = processor->handleDelete(paramsObj);
+        } else if (method == "update") {
+            result = processor->handleUpdate(paramsObj);
+        } else if (method == "set_auto_routing") {
+            result = processor->handleSetAutoRouting(paramsObj);
+        } else if (method == "start") {
+            result = processor->handleStart(paramsObj);
+        } else if (method == "stop") {
+            result = processor->handleStop(paramsObj);
+        } else if (method == "restart") {
+            result = processor->handleRestart(paramsObj);
+        } else if (method == "enable") {
+            result = processor->handleEnable(paramsObj);
+        } else if (method == "disable") {
+            result = processor->handleDisable(paramsObj);
+        } else if (method == "status") {
+            result = processor->handleStatus(paramsObj);
+        } else if (method == "list") {
+            result = processor->handleList(paramsObj);
+        } else if (method == "stats") {
+            result = processor->handleStats(paramsObj);
+        } else if (method == "add-custom-route") {
+            result = processor->handleAddCustomRoute(paramsObj);
+        } else if (method == "update-custom-route") {
+            result = processor->handleUpdateCustomRoute(paramsObj);
+        } else if (method == "delete-custom-route") {
+            result = processor->handleDeleteCustomRoute(paramsObj);
+        } else if (method == "list-custom-routes") {
+            result = processor->handleListCustomRoutes(paramsObj);
+        } else if (method == "get-custom-route") {
+            result = processor->handleGetCustomRoute(paramsObj);
+        } else if (method == "get-instance-routes") {
+            result = processor->handleGetInstanceRoutes(paramsObj);
+        } else if (method == "add-instance-route") {
+            result = processor->handleAddInstanceRoute(paramsObj);
+        } else if (method == "delete-instance-route") {
+            result = processor->handleDeleteInstanceRoute(paramsObj);
+        } else if (method == "apply-instance-routes") {
+            result = processor->handleApplyInstanceRoutes(paramsObj);
+        } else if (method == "detect-instance-routes") {
+            result = processor->handleDetectInstanceRoutes(paramsObj);
+        } else if (method == "purge-cleanup") {
+            result = processor->handlePurgeCleanup(paramsObj);
+        } else {
+            success = false;
+            errorMessage = "Unknown method: " + method;
+        }
+    } catch (const std::exception& e) {
+        success = false;
+        errorMessage = std::string("Operation failed: ") + e.what();
+        if (verbose) {
+            std::cerr << "Operation error: " << e.what() << std::endl;
+        }
+    }
+    
+    return success;
+}
+
+void VpnRpcOperationProcessor::processBatchStatic(std::shared_ptr<RequestContext> context, unsigned int threadId) {
+    nlohmann::json responses = nlohmann::json::array();
+    
+    try {
+        nlohmann::json batch = nlohmann::json::parse(context->requestJson);
+        const size_t count = batch.size();
+        
+        // "input_from" names the index of an earlier entry this one depends on;
+        // its layer is one past that entry's, and independent entries sit in layer 0
+        std::vector<int> inputFrom(count, -1);
+        std::vector<size_t> layer(count, 0);
+        size_t layerCount = 1;
+        bool hasDependencies = false;
+        for (size_t i = 0; i < count; ++i) {
+            const auto& request = batch[i];
+            if (!request.is_object() || !request.contains("input_from")) {
+                continue;
+            }
+            const auto& ref = request["input_from"];
+            if (!ref.is_number_integer() || ref.get<long long>() < 0 ||
+                static_cast<size_t>(ref.get<long long>()) >= i) {
+                // Only backward references are accepted, which also rules out cycles
+                inputFrom[i] = -2;
+                continue;
+            }
+            inputFrom[i] = ref.get<int>();
+            layer[i] = layer[inputFrom[i]] + 1;
+            layerCount = std::max(layerCount, layer[i] + 1);
+            hasDependencies = true;
+        }
+        
+        std::vector<nlohmann::json> entryResponses(count);
+        std::vector<char> succeeded(count, 0);
+        
+        auto runEntry = [&](size_t i) {
+            const auto& request = batch[i];
+            std::string transactionId = context->processor->extractTransactionId(request);
+            nlohmann::json result;
+            std::string errorMessage;
+            bool success = false;
+            
+            if (!request.is_object() || !request.contains("jsonrpc") || !request["jsonrpc"].is_string() ||
+                request["jsonrpc"].get<std::string>() != "2.0") {
+                errorMessage = "Invalid or missing JSON-RPC version";
+            } else if (!request.contains("method") || !request["method"].is_string()) {
+                errorMessage = "Missing method in request";
+            } else if (!request.contains("params") || !request["params"].is_object()) {
+                errorMessage = "Missing or invalid params in request";
+            } else if (inputFrom[i] == -2) {
+                errorMessage = "Invalid input_from reference";
+            } else if (inputFrom[i] >= 0 && !succeeded[inputFrom[i]]) {
+                errorMessage = "Dependency " + std::to_string(inputFrom[i]) + " failed";
+            } else {
+                try {
+                    success = dispatchOperation(context->processor, request["method"].get<std::string>(),
+                                                request["params"], result, errorMessage, context->verbose);
+                } catch (const std::exception& e) {
+                    errorMessage = std::string("Exception: ") + e.what();
+                }
+            }
+            
+            // A handler-level {"success": false} still completes the entry; only RPC errors block dependents
+            succeeded[i] = success;
+            entryResponses[i] = buildResponse(transactionId, success, success ? result.dump() : "", errorMessage);
+        };
+        
+        if (!hasDependencies) {
+            // Plain batches run in order on this thread, so later calls see the effects of earlier ones
+            for (size_t i = 0; i < count; ++i) {
+                runEntry(i);
+            }
+        } else {
+            // Entries of a layer only depend on earlier layers. Entries naming the same
+            // instance run in order on one task so their mutations never race, as do the
+            // entries naming none (they share state such as the custom routing rules);
+            // the groups run concurrently
+            auto groupKey = [&](size_t i) -> std::string {
+                const auto& request = batch[i];
+                if (request.is_object() && request.contains("params") && request["params"].is_object()) {
+                    const auto& params = request["params"];
+                    if (params.contains("instance_name") && params["instance_name"].is_string()) {
+                        return "instance:" + params["instance_name"].get<std::string>();
+                    }
+                }
+                return "";
+            };
+            
+            for (size_t current = 0; current < layerCount; ++current) {
+                std::map<std::string, std::vector<size_t>> groups;
+                for (size_t i = 0; i < count; ++i) {
+                    if (layer[i] == current) {
+                        groups[groupKey(i)].push_back(i);
+                    }
+                }
+                std::vector<std::future<void>> pending;
+                for (const auto& group : groups) {
+                    const std::vector<size_t>& entries = group.second;
+                    pending.push_back(std::async(std::launch::async, [&runEntry, &entries]() {
+                        for (size_t i : entries) {
+                            runEntry(i);
+                        }
+                    }));
+                }
+                for (auto& entry : pending) {
+                    entry.get();
+                }
+            }
+        }
+        
+        for (auto& response : entryResponses) {
+            responses.push_back(std::move(response));
+        }
+    } catch (const std::exception& e) {
+        responses.push_back(buildResponse(context->transactionId, false, "", std::string("Exception: ") + e.what()));
+    }
+    
+    publishResponse(responses.dump(), context->responseTopic, context->rpcClient);
+    
+    if (context->verbose) {
+        std::cout << "Thread " << threadId << " completed batch of " << responses.size() 
+                  << " requests" << std::endl;
+    }
+}
+
 void VpnRpcOperationProcessor::cleanupThreadTracking(unsigned int threadId, 
                                                      std::shared_ptr<RequestContext> context) {
     if (threadId > 0) {
@@ -284,6 +445,51 @@ void VpnRpcOperationProcessor::cleanupThreadTracking(unsigned int threadId,
     }
 }
 
+nlohmann::json VpnRpcOperationProcessor::buildResponse(const std::string& transactionId, bool success,
+                                                       const std::string& result, const std::string& error) {
+    nlohmann::json response;
+    response["jsonrpc"] = "2.0";
+    response["id"] = transactionId;
+
+    if (success) {
+        // Handle JSON result parsing
+        if (!result.empty() && result[0] == '{') {
+            try {
+                nlohmann::json parsedResult = nlohmann::json::parse(result);
+                response["result"] = parsedResult;
+            } catch (const nlohmann::json::parse_error&) {
+                response["result"] = result;
+            }
+        } else if (!result.empty()) {
+            response["result"] = result;
+        } else {
+            response["result"] = "Operation completed successfully";
+        }
+    } else {
+        // Error response format
+        nlohmann::json errorObj;
+        errorObj["code"] = -1;
+        errorObj["message"] = error;
+        response["error"] = errorObj;
+    }
+
+    return response;
+}
+
+void VpnRpcOperationProcessor::publishResponse(const std::string& responseStr, const std::string& responseTopic,
+                                               VpnRpcClient* rpcClient) {
+    // Publish to MQTT response topic
+    if (!responseTopic.empty() && rpcClient) {
+        // Both log lines go out in a single flush
+        std::cout << "RPC Response: " << responseStr << '\n'
+                  << "Publishing response to topic: " << responseTopic << std::endl;
+        rpcClient->sendResponse(responseTopic, responseStr);
+    } else {
+        std::cout << "RPC Response: " << responseStr << std::endl;
+        std::cerr << "Cannot publish response: topic empty or RPC client null" << std::endl;
+    }
+}
+
 void VpnRpcOperationProcessor::sendResponse(const std::string& transactionId, bool success,
                                            const std::string& result, const std::string& error) {
     sendResponseStatic(transactionId, success, result, error, responseTopic_);
@@ -293,43 +499,10 @@ void VpnRpcOperationProcessor::sendResponseWithClient(const std::string& transac
                                                        const std::string& result, const std::string& error,
                                                        const std::string& responseTopic, VpnRpcClient* rpcClient) {
     try {
-        nlohmann::json response;
-        response["jsonrpc"] = "2.0";
-        response["id"] = transactionId;
-
-        if (success) {
-            // Handle JSON result parsing
-            if (!result.empty() && result[0] == '{') {
-                try {
-                    nlohmann::json parsedResult = nlohmann::json::parse(result);
-                    response["result"] = parsedResult;
-                } catch (const nlohmann::json::parse_error&) {
-                    response["result"] = result;
-                }
-            } else if (!result.empty()) {
-                response["result"] = result;
-            } else {
-                response["result"] = "Operation completed successfully";
-            }
-        } else {
-            // Error response format
-            nlohmann::json errorObj;
-            errorObj["code"] = -1;
-            errorObj["message"] = error;
-            response["error"] = errorObj;
-        }
+        nlohmann::json response = buildResponse(transactionId, success, result, error);
 
         // Send response via MQTT
-        std::string responseStr = response.dump();
-        std::cout << "RPC Response: " << responseStr << std::endl;
-        
-        // Publish to MQTT response topic
-        if (!responseTopic.empty() && rpcClient) {
-            std::cout << "Publishing response to topic: " << responseTopic << std::endl;
-            rpcClient->sendResponse(responseTopic, responseStr);
-        } else {
-            std::cerr << "Cannot publish response: topic empty or RPC client null" << std::endl;
-        }
+        publishResponse(response.dump(), responseTopic, rpcClient);
 
     } catch (const std::exception& e) {
         std::cerr << "Failed to send response: " << e.what() << std::endl;
@@ -340,31 +513,7 @@ void VpnRpcOperationProcessor::sendResponseStatic(const std::string& transaction
                                                   const std::string& result, const std::string& error,
                                                   const std::string& responseTopic) {
     try {
-        nlohmann::json response;
-        response["jsonrpc"] = "2.0";
-        response["id"] = transactionId;
-
-        if (success) {
-            // Handle JSON result parsing
-            if (!result.empty() && result[0] == '{') {
-                try {
-                    nlohmann::json parsedResult = nlohmann::json::parse(result);
-                    response["result"] = parsedResult;
-                } catch (const nlohmann::json::parse_error&) {
-                    response["result"] = result;
-                }
-            } else if (!result.empty()) {
-                response["result"] = result;
-            } else {
-                response["result"] = "Operation completed successfully";
-            }
-        } else {
-            // Error response format
-            nlohmann::json errorObj;
-            errorObj["code"] = -1;
-            errorObj["message"] = error;
-            response["error"] = errorObj;
-        }
+        nlohmann::json response = buildResponse(transactionId, success, result, error);
 
         // For backward compatibility - just print the response
         std::cout << "RPC Response: " << response.dump() << std::endl;
@@ -374,6 +523,31 @@ void VpnRpcOperationProcessor::sendResponseStatic(const std::string& transaction
     }
 }
 
+std::shared_ptr<const VpnRpcOperationProcessor::ParsedConfig>
+VpnRpcOperationProcessor::parseConfig(const std::string& configContent) {
+    {
+        std::lock_guard<std::mutex> lock(parsedConfigCacheMutex_);
+        auto it = parsedConfigCache_.find(configContent);
+        if (it != parsedConfigCache_.end()) {
+            return it->second;
+        }
+    }
+    
+    // Parse outside the lock; a concurrent miss on the same config just parses twice
+    vpn_parser::VPNParser parser;
+    vpn_parser::ParseResult parse_result = parser.parse(configContent);
+    auto parsed = std::make_shared<const ParsedConfig>(ParsedConfig{
+        parse_result.success, parse_result.error_message, parse_result.protocol_detected,
+        parser.toJson(parse_result)});
+    
+    std::lock_guard<std::mutex> lock(parsedConfigCacheMutex_);
+    if (parsedConfigCache_.size() >= kParsedConfigCacheLimit) {
+        parsedConfigCache_.clear();
+    }
+    parsedConfigCache_.emplace(configContent, parsed);
+    return parsed;
+}
+
 // Operation handlers
 // ============================================================================
 // OPERATION HANDLERS - Matching HTTP Server Functionality
@@ -386,21 +560,18 @@ nlohmann::json VpnRpcOperationProcessor::handleParse(const nlohmann::json& param
     if (config_content.empty()) {
         result["success"] = false;
         result["error"] = "Missing 'config_content' field for parse operation";
+        result["code"] = static_cast<int>(RpcErrorCode::MISSING_PARAM);
     } else {
         try {
             // Use ur-vpn-parser library to extract configuration details
-            vpn_parser::VPNParser parser;
-            vpn_parser::ParseResult parse_result = parser.parse(config_content);
-            
-            // Convert parse result to JSON
-            nlohmann::json parsed_json = parser.toJson(parse_result);
+            auto parsed = parseConfig(config_content);
             
             // Return the parsed configuration data
-            result = parsed_json;
+            result = parsed->profile;
             
             if (verbose_) {
                 std::cout << "[Parse] Successfully parsed configuration: " 
-                         << parse_result.protocol_detected << std::endl;
+                         << parsed->protocolDetected << std::endl;
             }
             
         } catch (const std::exception& e) {
@@ -426,23 +597,23 @@ nlohmann::json VpnRpcOperationProcessor::handleAdd(const nlohmann::json& params)
     if (instance_name.empty() || config_content.empty()) {
         result["success"] = false;
         result["error"] = "Missing 'instance_name' or 'config_content' for add operation";
+        result["code"] = static_cast<int>(RpcErrorCode::MISSING_PARAM);
         return result;
     }
     
     try {
         // Use ur-vpn-parser library to auto-detect protocol and validate config
-        vpn_parser::VPNParser parser;
-        vpn_parser::ParseResult parse_result = parser.parse(config_content);
+        auto parsed = parseConfig(config_content);
         
-        if (!parse_result.success) {
+        if (!parsed->success) {
             result["success"] = false;
-            result["error"] = "Config parsing failed: " + parse_result.error_message;
-            result["protocol_detected"] = parse_result.protocol_detected;
+            result["error"] = "Config parsing failed: " + parsed->errorMessage;
+            result["protocol_detected"] = parsed->protocolDetected;
             return result;
         }
         
         // Use parser-detected protocol instead of user-provided vpn_type
-        std::string detected_protocol = parse_result.protocol_detected;
+        std::string detected_protocol = parsed->protocolDetected;
         
         if (verbose_) {
             std::cout << "[Add] Parser detected protocol: " << detected_protocol 
@@ -457,7 +628,7 @@ nlohmann::json VpnRpcOperationProcessor::handleAdd(const nlohmann::json& params)
         
         // Include parsed profile data in response for reference
         if (added) {
-            result["parsed_profile"] = parser.toJson(parse_result);
+            result["parsed_profile"] = parsed->profile;
         }
         
     } catch (const std::exception& e) {
@@ -478,6 +649,7 @@ nlohmann::json VpnRpcOperationProcessor::handleDelete(const nlohmann::json& para
     if (instance_name.empty()) {
         result["success"] = false;
         result["error"] = "Missing 'instance_name' for delete operation";
+        result["code"] = static_cast<int>(RpcErrorCode::MISSING_PARAM);
         return result;
     }
 
@@ -542,23 +714,23 @@ nlohmann::json VpnRpcOperationProcessor::handleUpdate(const nlohmann::json& para
     if (instance_name.empty() || config_content.empty()) {
         result["success"] = false;
         result["error"] = "Missing 'instance_name' or 'config_content' for update operation";
+        result["code"] = static_cast<int>(RpcErrorCode::MISSING_PARAM);
         return result;
     }
     
     try {
         // Use ur-vpn-parser library to auto-detect protocol and validate config
-        vpn_parser::VPNParser parser;
-        vpn_parser::ParseResult parse_result = parser.parse(config_content);
+        auto parsed = parseConfig(config_content);
         
-        if (!parse_result.success) {
+        if (!parsed->success) {
             result["success"] = false;
-            result["error"] = "Config parsing failed: " + parse_result.error_message;
-            result["protocol_detected"] = parse_result.protocol_detected;
+            result["error"] = "Config parsing failed: " + parsed->errorMessage;
+            result["protocol_detected"] = parsed->protocolDetected;
             return result;
         }
         
         // Use parser-detected protocol for update
-        std::string detected_protocol = parse_result.protocol_detected;
+        std::string detected_protocol = parsed->protocolDetected;
         
         if (verbose_) {
             std::cout << "[Update] Parser detected protocol: " << detected_protocol 
@@ -573,7 +745,7 @@ nlohmann::json VpnRpcOperationProcessor::handleUpdate(const nlohmann::json& para
         
         // Include parsed profile data in response for reference
         if (success) {
-            result["parsed_profile"] = parser.toJson(parse_result);
+            result["parsed_profile"] = parsed->profile;
         }
         
     } catch (const std::exception& e) {
@@ -624,6 +796,7 @@ nlohmann::json VpnRpcOperationProcessor::handleEnable(const nlohmann::json& para
     if (instance_name.empty()) {
         result["success"] = false;
         result["error"] = "Missing 'instance_name' for enable operation";
+        result["code"] = static_cast<int>(RpcErrorCode::MISSING_PARAM);
     } else {
         bool success = vpnManager_.enableInstance(instance_name);
         result["success"] = success;
@@ -639,6 +812,7 @@ nlohmann::json VpnRpcOperationProcessor::handleDisable(const nlohmann::json& par
     if (instance_name.empty()) {
         result["success"] = false;
         result["error"] = "Missing 'instance_name' for disable operation";
+        result["code"] = static_cast<int>(RpcErrorCode::MISSING_PARAM);
     } else {
         bool success = vpnManager_.disableInstance(instance_name);
         result["success"] = success;
@@ -665,21 +839,33 @@ nlohmann::json VpnRpcOperationProcessor::handleList(const nlohmann::json& params
     result["success"] = true;
     
     std::string vpn_type = params.value("vpn_type", "");
+    // count_only answers with the number of matching instances and leaves them out
+    bool count_only = params.value("count_only", false);
     nlohmann::json all_instances = vpnManager_.getAllInstancesStatus();
     
     if (vpn_type.empty()) {
-        result["instances"] = all_instances;
+        result["count"] = all_instances.size();
+        if (!count_only) {
+            result["instances"] = std::move(all_instances);
+        }
     } else {
+        // all_instances is a local snapshot, so matches are moved rather than copied
         nlohmann::json filtered_instances = nlohmann::json::array();
-        for (const auto& instance : all_instances) {
-            std::string instance_type = instance.value("type", "");
-            if (instance_type == vpn_type || 
-                (vpn_type == "openvpn" && instance_type == "openvpn") ||
-                (vpn_type == "wireguard" && instance_type == "wireguard")) {
-                filtered_instances.push_back(instance);
+        size_t count = 0;
+        for (auto& instance : all_instances) {
+            auto type_it = instance.find("type");
+            if (type_it != instance.end() && type_it->is_string() &&
+                type_it->get_ref<const std::string&>() == vpn_type) {
+                ++count;
+                if (!count_only) {
+                    filtered_instances.push_back(std::move(instance));
+                }
             }
         }
-        result["instances"] = filtered_instances;
+        result["count"] = count;
+        if (!count_only) {
+            result["instances"] = std::move(filtered_instances);
+        }
     }
     return result;
 }
@@ -700,6 +886,7 @@ nlohmann::json VpnRpcOperationProcessor::handleSetAutoRouting(const nlohmann::js
     if (instance_name.empty()) {
         result["success"] = false;
         result["error"] = "Missing 'instance_name' field for set_auto_routing operation";
+        result["code"] = static_cast<int>(RpcErrorCode::MISSING_PARAM);
         return result;
     }
     
@@ -743,6 +930,7 @@ nlohmann::json VpnRpcOperationProcessor::handleAddCustomRoute(const nlohmann::js
     if (rule.id.empty() || rule.vpn_instance.empty() || rule.destination.empty()) {
         result["success"] = false;
         result["error"] = "Missing required fields: id, vpn_instance, destination";
+        result["code"] = static_cast<int>(RpcErrorCode::MISSING_PARAM);
     } else {
         bool success = vpnManager_.addRoutingRule(rule);
         result["success"] = success;
@@ -758,6 +946,7 @@ nlohmann::json VpnRpcOperationProcessor::handleUpdateCustomRoute(const nlohmann:
     if (rule_id.empty()) {
         result["success"] = false;
         result["error"] = "Missing 'id' field for update-custom-route operation";
+        result["code"] = static_cast<int>(RpcErrorCode::MISSING_PARAM);
         return result;
     }
     
@@ -797,6 +986,7 @@ nlohmann::json VpnRpcOperationProcessor::handleDeleteCustomRoute(const nlohmann:
     if (rule_id.empty()) {
         result["success"] = false;
         result["error"] = "Missing 'id' field for delete-custom-route operation";
+        result["code"] = static_cast<int>(RpcErrorCode::MISSING_PARAM);
     } else {
         bool success = vpnManager_.deleteRoutingRule(rule_id);
         result["success"] = success;
@@ -808,7 +998,15 @@ nlohmann::json VpnRpcOperationProcessor::handleDeleteCustomRoute(const nlohmann:
 nlohmann::json VpnRpcOperationProcessor::handleListCustomRoutes(const nlohmann::json& params) {
     nlohmann::json result;
     result["success"] = true;
-    result["routing_rules"] = vpnManager_.getAllRoutingRules();
+    
+    // Optional 'id' narrows the listing to that rule via a direct lookup
+    std::string rule_id = params.value("id", "");
+    if (rule_id.empty()) {
+        result["routing_rules"] = vpnManager_.getAllRoutingRules();
+    } else {
+        nlohmann::json rule = vpnManager_.getRoutingRule(rule_id);
+        result["routing_rules"] = rule.contains("error") ? nlohmann::json::array() : nlohmann::json::array({rule});
+    }
     return result;
 }
 
@@ -819,6 +1017,7 @@ nlohmann::json VpnRpcOperationProcessor::handleGetCustomRoute(const nlohmann::js
     if (rule_id.empty()) {
         result["success"] = false;
         result["error"] = "Missing 'id' field for get-custom-route operation";
+        result["code"] = static_cast<int>(RpcErrorCode::MISSING_PARAM);
     } else {
         nlohmann::json rule = vpnManager_.getRoutingRule(rule_id);
         if (rule.contains("error")) {
@@ -839,12 +1038,25 @@ nlohmann::json VpnRpcOperationProcessor::handleGetInstanceRoutes(const nlohmann:
     if (instance_name.empty()) {
         result["success"] = false;
         result["error"] = "Missing 'instance_name' field";
+        result["code"] = static_cast<int>(RpcErrorCode::MISSING_PARAM);
     } else {
         nlohmann::json routes = vpnManager_.getInstanceRoutes(instance_name);
         if (routes.contains("error")) {
             result["success"] = false;
             result["error"] = routes["error"];
         } else {
+            // Optional 'id' returns just that route instead of the whole table
+            std::string rule_id = params.value("id", "");
+            if (!rule_id.empty()) {
+                nlohmann::json matching = nlohmann::json::array();
+                for (auto& route : routes) {
+                    if (route.value("id", "") == rule_id) {
+                        matching.push_back(std::move(route));
+                        break;
+                    }
+                }
+                routes = std::move(matching);
+            }
             result["success"] = true;
             result["routing_rules"] = routes;
         }
@@ -859,9 +1071,11 @@ nlohmann::json VpnRpcOperationProcessor::handleAddInstanceRoute(const nlohmann::
     if (instance_name.empty()) {
         result["success"] = false;
         result["error"] = "Missing 'instance_name' field";
+        result["code"] = static_cast<int>(RpcErrorCode::MISSING_PARAM);
     } else if (!params.contains("route_rule")) {
         result["success"] = false;
         result["error"] = "Missing 'route_rule' field";
+        result["code"] = static_cast<int>(RpcErrorCode::MISSING_PARAM);
     } else {
         vpn_manager::UnifiedRouteRule rule = vpn_manager::UnifiedRouteRule::from_json(params["route_rule"]);
         bool success = vpnManager_.addInstanceRoute(instance_name, rule);
@@ -880,9 +1094,11 @@ nlohmann::json VpnRpcOperationProcessor::handleDeleteInstanceRoute(const nlohman
     if (instance_name.empty()) {
         result["success"] = false;
         result["error"] = "Missing 'instance_name' field";
+        result["code"] = static_cast<int>(RpcErrorCode::MISSING_PARAM);
     } else if (!params.contains("rule_id")) {
         result["success"] = false;
         result["error"] = "Missing 'rule_id' field";
+        result["code"] = static_cast<int>(RpcErrorCode::MISSING_PARAM);
     } else {
         std::string rule_id = params["rule_id"].get<std::string>();
         bool success = vpnManager_.deleteInstanceRoute(instance_name, rule_id);
@@ -901,6 +1117,7 @@ nlohmann::json VpnRpcOperationProcessor::handleApplyInstanceRoutes(const nlohman
     if (instance_name.empty()) {
         result["success"] = false;
         result["error"] = "Missing 'instance_name' field";
+        result["code"] = static_cast<int>(RpcErrorCode::MISSING_PARAM);
     } else {
         bool success = vpnManager_.applyInstanceRoutes(instance_name);
         result["success"] = success;
@@ -918,6 +1135,7 @@ nlohmann::json VpnRpcOperationProcessor::handleDetectInstanceRoutes(const nlohma
     if (instance_name.empty()) {
         result["success"] = false;
         result["error"] = "Missing 'instance_name' field";
+        result["code"] = static_cast<int>(RpcErrorCode::MISSING_PARAM);
     } else {
         int detected = vpnManager_.detectInstanceRoutes(instance_name);
         if (detected < 0) {
@@ -9,6 +9,7 @@
 #include <atomic>
 #include <mutex>
 #include <set>
+#include <unordered_map>
 #include <future>
 
 // Forward declaration
@@ -16,6 +17,13 @@ class VpnRpcClient;
 
 namespace vpn_manager {
 
+/**
+ * @brief Numeric error codes returned alongside "error" in handler results
+ */
+enum class RpcErrorCode : int {
+    MISSING_PARAM = 1
+};
+
 /**
  * @brief RPC Operation Processor for VPN Instance Manager
  * 
@@ -67,6 +75,19 @@ private:
     // Response topic
     std::string responseTopic_;
     
+    // Parsed form of a config_content, shared by parse/add/update
+    struct ParsedConfig {
+        bool success;
+        std::string errorMessage;
+        std::string protocolDetected;
+        nlohmann::json profile;
+    };
+    
+    // Config parse results keyed by the exact config text; clients resend the same configs
+    static constexpr size_t kParsedConfigCacheLimit = 32;
+    std::unordered_map<std::string, std::shared_ptr<const ParsedConfig>> parsedConfigCache_;
+    std::mutex parsedConfigCacheMutex_;
+    
     // Request context for thread-safe data passing
     struct RequestContext {
         std::string requestJson;
@@ -76,6 +97,7 @@ private:
         VpnRpcOperationProcessor* processor;
         VpnRpcClient* rpcClient;
         bool verbose;
+        bool isBatch = false;  // requestJson holds a JSON-RPC batch array
         // Thread synchronization primitives
         std::shared_ptr<std::promise<unsigned int>> threadIdPromise;
         std::shared_future<unsigned int> threadIdFuture;
@@ -84,8 +106,16 @@ private:
     // Processing methods
     void processOperationThread(std::shared_ptr<RequestContext> context);
     static void processOperationThreadStatic(std::shared_ptr<RequestContext> context);
+    static void processBatchStatic(std::shared_ptr<RequestContext> context, unsigned int threadId);
+    static bool dispatchOperation(VpnRpcOperationProcessor* processor, const std::string& method,
+                                  const nlohmann::json& paramsObj, nlohmann::json& result,
+                                  std::string& errorMessage, bool verbose);
     
     // Response handling
+    static nlohmann::json buildResponse(const std::string& transactionId, bool success,
+                                        const std::string& result, const std::string& error);
+    static void publishResponse(const std::string& responseStr, const std::string& responseTopic,
+                                VpnRpcClient* rpcClient);
     void sendResponse(const std::string& transactionId, bool success, 
                       const std::string& result, const std::string& error = "");
     static void sendResponseStatic(const std::string& transactionId, bool success,
@@ -122,6 +152,7 @@ private:
     nlohmann::json handlePurgeCleanup(const nlohmann::json& params);
     
     // Utility methods
+    std::shared_ptr<const ParsedConfig> parseConfig(const std::string& configContent);
     std::string extractTransactionId(const nlohmann::json& request);
     std::shared_ptr<RequestContext> createContext(const nlohmann::json& request, 
                                                    const std::string& transactionId);
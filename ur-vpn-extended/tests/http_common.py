@@ -0,0 +1,89 @@
+"""
+Shared helpers for the VPN Instance Manager HTTP API test scripts
+"""
+
+import functools
+import json
+import os
+import sys
+
+import requests
+
+try:
+    import orjson
+    encode_payload = orjson.dumps
+    
+    def _json_pretty(body: bytes) -> str:
+        return orjson.dumps(orjson.loads(body), option=orjson.OPT_INDENT_2).decode('utf-8')
+except ImportError:
+    # Fall back to the stdlib codec when orjson is not installed
+    def encode_payload(payload) -> bytes:
+        return json.dumps(payload).encode('utf-8')
+    
+    def _json_pretty(body: bytes) -> str:
+        return json.dumps(json.loads(body), indent=2)
+
+# VPN_TEST_VERBOSE=0 prints only the status code of each response, as in the RPC suite
+VERBOSE = os.environ.get("VPN_TEST_VERBOSE", "1") != "0"
+
+# Server address; the default is the http_server port in config/master-config.json
+API_BASE_URL = os.environ.get("VPN_API_BASE_URL", "http://0.0.0.0:5000")
+API_ENDPOINT = f"{API_BASE_URL}/api/operations/"
+
+# Seconds to wait on the server before a request fails instead of hanging
+API_TIMEOUT = float(os.environ.get("VPN_API_TIMEOUT", "60"))
+
+# One pooled keep-alive connection for every request the process sends
+SESSION = requests.Session()
+
+# Headers for posting a body pre-encoded with encode_payload()
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# URL and merged session/JSON headers are prepared once; each call only attaches its body
+_PREPARED_POST = SESSION.prepare_request(requests.Request("POST", API_ENDPOINT, headers=JSON_HEADERS))
+
+# Session.send() skips the environment lookup Session.request() does; resolve the
+# proxies, CA bundle and verify settings for the endpoint once and pass them along
+_SEND_KWARGS = SESSION.merge_environment_settings(API_ENDPOINT, {}, None, None, None)
+
+def post_body(body: bytes) -> requests.Response:
+    """POST an already encoded operation request"""
+    request = _PREPARED_POST.copy()
+    request.prepare_body(data=body, files=None)
+    return SESSION.send(request, timeout=API_TIMEOUT, **_SEND_KWARGS)
+
+def post_operation(operation_type: str, **params) -> requests.Response:
+    """POST an operation request; params left as None are omitted"""
+    payload = {"operation_type": operation_type}
+    payload.update((key, value) for key, value in params.items() if value is not None)
+    return post_body(encode_payload(payload))
+
+def print_response(response):
+    """Pretty print the API response, or only its status code when output is quieted"""
+    print(f"Status Code: {response.status_code}")
+    if not VERBOSE:
+        return
+    try:
+        print(f"Response:\n{_json_pretty(response.content)}")
+    except ValueError:
+        print(f"Response: {response.text}")
+
+@functools.lru_cache(maxsize=64)
+def read_config_file(filepath):
+    """Read VPN configuration from file; repeat reads of a path in one process hit the cache"""
+    try:
+        # Binary read into one sized buffer and a single decode
+        with open(filepath, 'rb') as f:
+            buf = bytearray(os.fstat(f.fileno()).st_size)
+            n = f.readinto(buf)
+        text = buf[:n].decode('utf-8')
+        # Same newlines as a text-mode read; only configs containing '\r' pay for the pass
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        return text
+    except FileNotFoundError:
+        print(f"Error: File '{filepath}' not found")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error reading file: {e}")
+        sys.exit(1)
@@ -4,18 +4,181 @@ Base RPC Test Class for ur-vpn-manager
 Provides common functionality for testing RPC operations via MQTT
 """
 
+import io
+import asyncio
+import os
+import atexit
+import sys
 import json
 import time
-from typing import Dict, Any, Optional
+import hashlib
+import functools
+import inspect
+import itertools
+import threading
+from enum import IntEnum
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple
 import paho.mqtt.client as mqtt
 
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+    
+    def _json_pretty(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode('utf-8')
+except ImportError:
+    # Fall back to the stdlib codec when orjson is not installed
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+    _json_loads = json.loads
+    
+    def _json_pretty(obj) -> str:
+        return json.dumps(obj, indent=2)
+
+# Public names of the codec for scripts built on this module: json_dumps() returns bytes,
+# json_loads() accepts bytes or str
+json_dumps = _json_dumps
+json_loads = _json_loads
+
+# Read-only RPC methods whose responses may be served from the short-lived response cache
+READ_ONLY_METHODS = frozenset({"detect-instance-routes", "list", "status", "get-instance-routes"})
+RESPONSE_CACHE_TTL = 0.75  # seconds
+
+# VPN_TEST_VERBOSE=0 keeps only failure details and one line per passing test
+VERBOSE = os.environ.get("VPN_TEST_VERBOSE", "1") != "0"
+
+# Per-process sequence so concurrently created clients get distinct MQTT client ids
+_client_sequence = itertools.count()
+
+# Per-process sequence behind BaseRPCTest.unique_name()
+_name_sequence = itertools.count()
+
+# Serializes the per-test output flushes of run_test()
+_output_lock = threading.Lock()
+
+# Minimal OpenVPN client config used by instance fixtures (already stripped)
+DEFAULT_OVPN_CLIENT_CONFIG = "client\ndev tun\nproto udp\nremote 127.0.0.1 1194"
+
+# Request prefix shared by every encoded RPC call; the method name follows
+_REQUEST_HEAD = b'{"jsonrpc":"2.0","method":'
+
+# (required, optional) params of the request shapes the tests send most often;
+# each gets a generated send_<method>() that encodes straight into a byte template
+SPECIALIZED_METHODS = {
+    "add": (("instance_name", "config_content"), ("vpn_type", "auto_start")),
+    "delete": (("instance_name",), ()),
+    "start": (("instance_name",), ()),
+    "disable": (("instance_name",), ()),
+    "add-instance-route": (("instance_name", "route_rule"), ()),
+    "delete-instance-route": (("instance_name", "rule_id"), ()),
+    "detect-instance-routes": (("instance_name",), ()),
+    "stats": ((), ()),
+    "status": ((), ("instance_name",)),
+    "stop": (("instance_name",), ()),
+}
+
+class EncodedRequest(NamedTuple):
+    """A request with fixed params whose body, up to the id, is encoded once"""
+    method: str
+    params: Dict[str, Any]
+    prefix: bytes
+
+def encode_request(method: str, params: Dict[str, Any]) -> EncodedRequest:
+    """Pre-encode a fixed request for BaseRPCTest.send_encoded()"""
+    prefix = _REQUEST_HEAD + _json_dumps(method) + b',"params":' + _json_dumps(params) + b',"id":'
+    return EncodedRequest(method, params, prefix)
+
+class ErrorCode(IntEnum):
+    """Numeric 'code' values returned in failed handler results (mirrors RpcErrorCode)"""
+    MISSING_PARAM = 1
+
+# Error message prefixes for assertions that still need to tell missing parameters apart
+MISSING_INSTANCE_NAME = "Missing 'instance_name'"
+MISSING_ID = "Missing 'id' field"
+MISSING_ROUTE_RULE = "Missing 'route_rule'"
+MISSING_RULE_ID = "Missing 'rule_id'"
+MISSING_REQUIRED_FIELDS = "Missing required fields"
+RULE_NOT_FOUND = "Rule not found"
+
+def print_response(response):
+    """Pretty print the RPC response, unless output is quieted"""
+    if VERBOSE:
+        print(f"Response:\n{_json_pretty(response)}")
+
+def load_config_file(filepath) -> str:
+    """Read VPN configuration from file on every call; raises OSError or UnicodeDecodeError"""
+    # One sized buffer and a single decode
+    with open(filepath, 'rb') as f:
+        buf = bytearray(os.fstat(f.fileno()).st_size)
+        n = f.readinto(buf)
+    text = buf[:n].decode('utf-8')
+    # Same newlines as a text-mode read; only configs containing '\r' pay for the pass
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+@functools.lru_cache(maxsize=64)
+def read_config_file(filepath):
+    """Read VPN configuration from file for a single-shot script, exiting on errors;
+    repeat reads of a path in one process hit the cache"""
+    try:
+        return load_config_file(filepath)
+    except FileNotFoundError:
+        print(f"Error: File '{filepath}' not found")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error reading file: {e}")
+        sys.exit(1)
+
+def _write_output(output: str):
+    """Write one test's output to stdout without interleaving it with other threads"""
+    with _output_lock:
+        sys.stdout.write(output)
+        sys.stdout.flush()
+
+def _instance_key(instance_name: str, config_content: str, vpn_type: str, auto_start: bool):
+    """ensure_instance() cache key; the config is reduced to a blake2b digest"""
+    return (instance_name, hashlib.blake2b(config_content.encode()).digest(), vpn_type, auto_start)
+
+def _resolve_future(future: asyncio.Future, response: Dict[str, Any]):
+    """Complete a send_rpc_request_async future on its own event loop"""
+    if not future.done():
+        future.set_result(response)
+
 class BaseRPCTest:
     """Base class for RPC operations testing"""
     
-    def __init__(self, broker_host: str = "127.0.0.1", broker_port: int = 1899):
+    # Fixed per-instance attributes; subclasses declare empty __slots__ so no
+    # instance carries a __dict__
+    __slots__ = (
+        'broker_host', 'broker_port', 'client_id', 'request_topic', 'response_topic',
+        'client', 'response_received', 'response_data', 'response_timeout',
+        'pending_request_id', 'request_sequence', 'log_buffer', 'pending_futures',
+        'subscribed', 'id_marker', 'cleanup_requests', 'response_cache', 'cache_generation',
+        'verbose', 'awaiting_null_id',
+    )
+    
+    # Successful 'add' responses keyed by (instance_name, config digest, vpn_type, auto_start),
+    # shared across test objects so a fixture requested again is only provisioned once;
+    # a successful delete or purge-cleanup drops the affected entries
+    _instance_cache: Dict[Tuple[str, bytes, str, bool], Dict[str, Any]] = {}
+    _instance_cache_lock = threading.Lock()
+    
+    # Test class -> names of its test_* methods in definition order, filled by discover_tests()
+    _discovered_tests: Dict[type, Tuple[str, ...]] = {}
+    
+    def __init__(self, broker_host: str = "127.0.0.1", broker_port: int = 1899,
+                 log_buffer: Optional[io.StringIO] = None, verbose: Optional[bool] = None):
+        self.log_buffer = log_buffer
+        # Progress logging for this client; defaults to the VPN_TEST_VERBOSE switch
+        self.verbose = VERBOSE if verbose is None else verbose
         self.broker_host = broker_host
         self.broker_port = broker_port
-        self.client_id = f"test_client_{int(time.time())}"
+        self.client_id = f"test_client_{os.getpid()}_{next(_client_sequence)}"
+        # Every id this client sends starts with this, quoted as it appears in a reply
+        self.id_marker = f'"{self.client_id}_'.encode()
         self.request_topic = "direct_messaging/ur-vpn-manager/requests"
         self.response_topic = "direct_messaging/ur-vpn-manager/responses"
         
@@ -27,62 +190,122 @@ class BaseRPCTest:
                     client_id=self.client_id,
                     callback_api_version=mqtt.CallbackAPIVersion.VERSION2
                 )
-                print("✓ Using MQTT client with API version 2.0")
+                if self.verbose:
+                    self.log("✓ Using MQTT client with API version 2.0")
             else:
                 # Use older API version
                 self.client = mqtt.Client(self.client_id)
-                print("✓ Using MQTT client with legacy API")
+                if self.verbose:
+                    self.log("✓ Using MQTT client with legacy API")
         except Exception as e:
             # Ultimate fallback
-            print(f"⚠️ MQTT client initialization warning: {e}")
+            self.log(f"⚠️ MQTT client initialization warning: {e}")
             self.client = mqtt.Client(self.client_id)
         
         self.client.on_connect = self._on_connect
+        self.client.on_subscribe = self._on_subscribe
         self.client.on_message = self._on_message
+        # Set once the broker acknowledges the response topic subscription
+        self.subscribed = threading.Event()
         
         # Response tracking
         self.response_received = False
         self.response_data = None
         self.response_timeout = 10  # seconds
+        self.pending_request_id = None
+        # Set while send_raw_request() waits for a reply whose id is null
+        self.awaiting_null_id = False
+        self.request_sequence = itertools.count()
+        # request id -> (event loop, future) for send_rpc_request_async calls in flight
+        self.pending_futures: Dict[str, Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = {}
+        # (method, params) requests that undo this client's fixtures, sent by teardown()
+        self.cleanup_requests: List[Tuple[str, Dict[str, Any]]] = []
+        # (method, params) -> (expiry, response) for READ_ONLY_METHODS. Only this
+        # client's thread touches it; any other RPC clears it and bumps the generation
+        self.response_cache: Dict[Tuple[str, frozenset], Tuple[float, Dict[str, Any]]] = {}
+        self.cache_generation = 0
         
     def _on_connect(self, client, userdata, flags, rc, properties=None):
         """MQTT connection callback (compatible with both API versions)"""
         if rc == 0:
-            print(f"✓ Connected to MQTT broker at {self.broker_host}:{self.broker_port}")
             client.subscribe(self.response_topic)
-            print(f"✓ Subscribed to response topic: {self.response_topic}")
+            if self.verbose:
+                self.log(f"✓ Connected to MQTT broker at {self.broker_host}:{self.broker_port}")
+                self.log(f"✓ Subscribed to response topic: {self.response_topic}")
         else:
-            print(f"✗ Failed to connect to MQTT broker: {rc}")
+            self.log(f"✗ Failed to connect to MQTT broker: {rc}")
             
+    def _on_subscribe(self, client, userdata, mid, *args):
+        """MQTT subscribe callback (compatible with both API versions)"""
+        self.subscribed.set()
+        
     def _on_message(self, client, userdata, msg, properties=None):
         """MQTT message callback (compatible with both API versions)"""
         try:
+            # Every client shares the response topic; skip decoding replies that
+            # cannot carry one of our generated ids (unless a caller-chosen or null id is awaited)
+            pending = self.pending_request_id
+            if (self.id_marker not in msg.payload and not self.awaiting_null_id
+                    and (pending is None or pending.startswith(self.client_id))):
+                return
             payload = msg.payload.decode('utf-8')
-            print(f"📨 Received message on {msg.topic}: {payload}")
+            if self.verbose:
+                self.log(f"📨 Received message on {msg.topic}: {payload}")
             
             if msg.topic == self.response_topic:
-                self.response_data = json.loads(payload)
+                response = _json_loads(msg.payload)
+                # A batch reply is an array in request order, matched by its first id
+                if isinstance(response, list):
+                    response_id = response[0].get('id') if response else None
+                else:
+                    response_id = response.get('id')
+                waiter = self.pending_futures.get(response_id)
+                if waiter is not None:
+                    loop, future = waiter
+                    loop.call_soon_threadsafe(_resolve_future, future, response)
+                    return
+                # Only accept the reply we are blocked on
+                if response_id != self.pending_request_id:
+                    return
+                self.response_data = response
                 self.response_received = True
         except Exception as e:
-            print(f"✗ Error processing message: {e}")
+            self.log(f"✗ Error processing message: {e}")
+            
+    def log(self, message: str):
+        """Write a line to the current test's buffer, or straight to stdout outside run_test()"""
+        buffer = self.log_buffer
+        if buffer is None:
+            print(message)
+        else:
+            buffer.write(message)
+            buffer.write("\n")
             
     def setup(self):
         """Setup test environment - connect to MQTT broker only"""
-        print("🔧 Setting up test environment...")
+        if self.verbose:
+            self.log("🔧 Setting up test environment...")
         
         # Connect to MQTT broker
         try:
+            self.subscribed.clear()
             self.client.connect(self.broker_host, self.broker_port, 60)
             self.client.loop_start()
-            time.sleep(1)  # Wait for connection
-            return True
         except Exception as e:
-            print(f"✗ Failed to connect to MQTT broker: {e}")
+            self.log(f"✗ Failed to connect to MQTT broker: {e}")
             return False
+            
+        # Ready as soon as replies can reach us, rather than after a fixed delay
+        if not self.subscribed.wait(self.response_timeout):
+            self.log("✗ Timed out waiting for response topic subscription")
+            return False
+        return True
         
     def teardown(self):
-        """Cleanup test environment - disconnect from MQTT broker only"""
-        print("🧹 Cleaning up test environment...")
+        """Cleanup test environment - remove queued fixtures, then disconnect from MQTT broker"""
+        if self.verbose:
+            self.log("🧹 Cleaning up test environment...")
+        self._run_cleanup()
         
         # Stop MQTT client
         if self.client:
@@ -90,25 +313,45 @@ class BaseRPCTest:
             self.client.disconnect()
             
     def send_rpc_request(self, method: str, params: Dict[str, Any], 
-                        request_id: Optional[str] = None) -> Dict[str, Any]:
-        """Send RPC request and wait for response"""
+                        request_id: Optional[str] = None, use_cache: bool = True) -> Dict[str, Any]:
+        """Send RPC request and wait for response; use_cache=False always asks the server"""
+        body = [_REQUEST_HEAD, _json_dumps(method), b',"params":', _json_dumps(params), b',"id":']
+        return self._raw_send(method, body, params, request_id, use_cache)
+        
+    def send_encoded(self, request: EncodedRequest) -> Dict[str, Any]:
+        """Send a request pre-encoded by encode_request() and wait for the response"""
+        return self._raw_send(request.method, [request.prefix], request.params)
+        
+    def _raw_send(self, method: str, body: list, params: Optional[Dict[str, Any]] = None,
+                  request_id: Optional[str] = None, use_cache: bool = True) -> Dict[str, Any]:
+        """Complete a pre-encoded request body with its id, send it and wait for the response"""
+        cache_key = None if params is None else self._response_cache_key(method, params)
+        if cache_key is not None and use_cache:
+            cached = self._cached_response(cache_key)
+            if cached is not None:
+                self.log(f"📦 Using cached response for: {method}")
+                return cached
+                
         if request_id is None:
-            request_id = f"test_{int(time.time())}"
+            request_id = f"{self.client_id}_{next(self.request_sequence)}"
             
+        body += (_json_dumps(request_id), b'}')
+        generation = self._cache_generation(method)
+        response = self._publish_and_wait(request_id, b''.join(body))
+        
+        self._invalidate_instance_cache(method, params, response)
+        self._store_response(method, cache_key, response, generation)
+        return response
+        
+    def _publish_and_wait(self, request_id: str, request_json: bytes) -> Any:
+        """Publish an encoded request and block until the reply carrying request_id arrives"""
         # Reset response tracking
         self.response_received = False
         self.response_data = None
+        self.pending_request_id = request_id
         
-        # Build RPC request
-        request = {
-            "jsonrpc": "2.0",
-            "method": method,
-            "params": params,
-            "id": request_id
-        }
-        
-        request_json = json.dumps(request)
-        print(f"📤 Sending RPC request: {request_json}")
+        if self.verbose:
+            self.log(f"📤 Sending RPC request: {request_json.decode('utf-8')}")
         
         # Send request
         result = self.client.publish(self.request_topic, request_json)
@@ -122,9 +365,222 @@ class BaseRPCTest:
             
         if not self.response_received:
             raise Exception("Timeout waiting for RPC response")
-            
         return self.response_data
         
+    def send_raw_request(self, request_json: bytes) -> Any:
+        """Publish a hand-built payload the server cannot take an id from and wait for its id-null reply"""
+        self.awaiting_null_id = True
+        try:
+            return self._publish_and_wait(None, request_json)
+        finally:
+            self.awaiting_null_id = False
+            
+    def send_rpc_batch(self, requests: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Send (method, params) requests as one JSON-RPC batch; responses in request order.
+
+        The server runs a batch's entries in order, so an entry may depend on
+        the effects of the ones before it.
+        """
+        return self._send_batch([(method, params, None) for method, params in requests])
+        
+    def send_rpc_dependent_batch(self, requests: List[Tuple[str, Dict[str, Any], Optional[int]]]) -> List[Dict[str, Any]]:
+        """Send (method, params, input_from) requests as one batch executed in dependency layers.
+
+        input_from is the index of an earlier entry that must complete first, or
+        None. Independent entries naming different instances may run
+        concurrently; those sharing an instance_name, or naming none, run in order.
+        """
+        return self._send_batch(requests)
+        
+    def _send_batch(self, requests: List[Tuple[str, Dict[str, Any], Optional[int]]]) -> List[Dict[str, Any]]:
+        if not requests:
+            return []
+            
+        request_ids = [f"{self.client_id}_{next(self.request_sequence)}" for _ in requests]
+        batch = []
+        for (method, params, input_from), request_id in zip(requests, request_ids):
+            entry = {"jsonrpc": "2.0", "method": method, "params": params, "id": request_id}
+            if input_from is not None:
+                entry["input_from"] = input_from
+            batch.append(entry)
+            generation = self._cache_generation(method)
+        replies = self._publish_and_wait(request_ids[0], _json_dumps(batch))
+        
+        by_id = {reply.get('id'): reply for reply in replies}
+        responses = [by_id[request_id] for request_id in request_ids]
+        for (method, params, _), response in zip(requests, responses):
+            self._invalidate_instance_cache(method, params, response)
+            self._store_response(method, None, response, generation)
+        return responses
+        
+    async def send_rpc_request_async(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Async variant of send_rpc_request; any number may be in flight on this client"""
+        cache_key = self._response_cache_key(method, params)
+        if cache_key is not None:
+            cached = self._cached_response(cache_key)
+            if cached is not None:
+                self.log(f"📦 Using cached response for: {method}")
+                return cached
+                
+        request_id = f"{self.client_id}_{next(self.request_sequence)}"
+        generation = self._cache_generation(method)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending_futures[request_id] = (loop, future)
+        
+        request_json = b''.join((_REQUEST_HEAD, _json_dumps(method), b',"params":', _json_dumps(params),
+                                 b',"id":', _json_dumps(request_id), b'}'))
+        if self.verbose:
+            self.log(f"📤 Sending RPC request: {request_json.decode('utf-8')}")
+        
+        try:
+            result = self.client.publish(self.request_topic, request_json)
+            if result.rc != 0:
+                raise Exception(f"Failed to publish request: {result.rc}")
+            response = await asyncio.wait_for(future, self.response_timeout)
+        except asyncio.TimeoutError:
+            raise Exception("Timeout waiting for RPC response")
+        finally:
+            self.pending_futures.pop(request_id, None)
+            
+        self._invalidate_instance_cache(method, params, response)
+        self._store_response(method, cache_key, response, generation)
+        return response
+        
+    def send_rpc_requests(self, requests: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Send independent (method, params) requests concurrently; responses in request order"""
+        async def gather():
+            return await asyncio.gather(*(self.send_rpc_request_async(method, params)
+                                          for method, params in requests))
+        return asyncio.run(gather())
+        
+    def _response_cache_key(self, method: str, params: Dict[str, Any]):
+        """Cache key for read-only requests, None when the request must hit the server"""
+        if method not in READ_ONLY_METHODS:
+            return None
+        try:
+            return (method, frozenset(params.items()))
+        except TypeError:
+            # Nested params are not hashable; send those uncached
+            return None
+            
+    def _cached_response(self, cache_key):
+        """Return a still-fresh cached response, or None"""
+        entry = self.response_cache.get(cache_key)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+        
+    def _cache_generation(self, method: str) -> int:
+        """Generation a reply must still match to be cached; sending a mutating request starts a new one"""
+        if method not in READ_ONLY_METHODS:
+            self.cache_generation += 1
+        return self.cache_generation
+        
+    def _store_response(self, method: str, cache_key, response: Dict[str, Any], generation: int):
+        """Cache a read-only response, or flush the cache after a mutating request.
+
+        A read reply is only kept if no mutating request was sent or answered
+        while it was in flight, so it cannot predate a concurrent change.
+        """
+        if cache_key is not None:
+            if generation == self.cache_generation:
+                self.response_cache[cache_key] = (time.monotonic() + RESPONSE_CACHE_TTL, response)
+        elif method not in READ_ONLY_METHODS:
+            self.response_cache.clear()
+            self.cache_generation += 1
+        
+    def unique_name(self, prefix: str) -> str:
+        """Instance name that no other test, thread or concurrent run will use; deleted by teardown()"""
+        name = f"{prefix}_{os.getpid()}_{next(_name_sequence)}"
+        self.add_cleanup("delete", {"instance_name": name})
+        return name
+        
+    def add_custom_routes(self, routes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Add custom route fixtures in one batch, asserting every reply; deleted by teardown()"""
+        for route in routes:
+            self.add_cleanup("delete-custom-route", {"id": route["id"]})
+        responses = self.send_rpc_batch([("add-custom-route", route) for route in routes])
+        return [self.assert_ok(response) for response in responses]
+        
+    def add_cleanup(self, method: str, params: Dict[str, Any]):
+        """Queue a request that undoes a fixture; teardown() sends the queue as one batch"""
+        self.cleanup_requests.append((method, params))
+        
+    def _run_cleanup(self):
+        """Send the queued cleanup requests, newest first; failures are only logged"""
+        requests, self.cleanup_requests = self.cleanup_requests, []
+        if not requests or not self.client.is_connected():
+            return
+        # Fixtures a test already removed just come back as errors here
+        try:
+            self.send_rpc_batch(requests[::-1])
+        except Exception as e:
+            self.log(f"⚠️ Fixture cleanup failed: {e}")
+        
+    def ensure_instance(self, instance_name: str, config_content: str,
+                        vpn_type: str = "openvpn", auto_start: bool = False) -> Dict[str, Any]:
+        """Add a VPN instance unless an identical one was already provisioned"""
+        key = _instance_key(instance_name, config_content, vpn_type, auto_start)
+        with self._instance_cache_lock:
+            cached = self._instance_cache.get(key)
+        if cached is not None:
+            self.log(f"✓ Reusing provisioned instance: {instance_name}")
+            return cached
+            
+        response = self.send_add(instance_name, config_content, vpn_type, auto_start)
+        self._remember_instance(key, response)
+        return response
+        
+    async def ensure_instance_async(self, instance_name: str, config_content: str,
+                                    vpn_type: str = "openvpn", auto_start: bool = False) -> Dict[str, Any]:
+        """Async variant of ensure_instance"""
+        key = _instance_key(instance_name, config_content, vpn_type, auto_start)
+        with self._instance_cache_lock:
+            cached = self._instance_cache.get(key)
+        if cached is not None:
+            self.log(f"✓ Reusing provisioned instance: {instance_name}")
+            return cached
+            
+        response = await self.send_rpc_request_async("add", {
+            "instance_name": instance_name,
+            "config_content": config_content,
+            "vpn_type": vpn_type,
+            "auto_start": auto_start
+        })
+        self._remember_instance(key, response)
+        return response
+        
+    def ensure_instances(self, instance_names: List[str], config_content: str,
+                         vpn_type: str = "openvpn", auto_start: bool = False) -> List[Dict[str, Any]]:
+        """ensure_instance for several instances, provisioning the missing ones concurrently"""
+        async def provision():
+            return await asyncio.gather(*(self.ensure_instance_async(name, config_content, vpn_type, auto_start)
+                                          for name in instance_names))
+        return asyncio.run(provision())
+        
+    def _remember_instance(self, key, response: Dict[str, Any]):
+        """Cache a successful 'add' reply for ensure_instance()"""
+        if response.get('result', {}).get('success'):
+            with self._instance_cache_lock:
+                self._instance_cache[key] = response
+                
+    def _invalidate_instance_cache(self, method: str, params: Optional[Dict[str, Any]], response: Dict[str, Any]):
+        """Drop cached instance fixtures removed by a delete or purge-cleanup"""
+        if method not in ("delete", "purge-cleanup"):
+            return
+        if not response.get('result', {}).get('success'):
+            return
+            
+        with self._instance_cache_lock:
+            if method == "purge-cleanup":
+                self._instance_cache.clear()
+                return
+                
+            instance_name = params.get("instance_name")
+            for key in [k for k in self._instance_cache if k[0] == instance_name]:
+                del self._instance_cache[key]
+        
     def assert_success(self, response: Dict[str, Any], expected_success: bool = True):
         """Assert that response indicates success"""
         if 'result' in response:
@@ -133,34 +589,188 @@ class BaseRPCTest:
                 assert result['success'] == expected_success, \
                     f"Expected success={expected_success}, got success={result['success']}"
                 if not expected_success and 'error' in result:
-                    print(f"Expected error: {result['error']}")
+                    self.log(f"Expected error: {result['error']}")
             else:
-                print("Response doesn't contain 'success' field, assuming success")
+                self.log("Response doesn't contain 'success' field, assuming success")
         else:
-            print("Response doesn't contain 'result' field, checking for 'error'")
+            self.log("Response doesn't contain 'result' field, checking for 'error'")
             assert 'error' not in response, f"Unexpected error in response: {response}"
             
     def assert_contains_fields(self, response: Dict[str, Any], *fields):
         """Assert that response contains specified fields"""
         if 'result' in response:
-            result = response['result']
-            for field in fields:
-                assert field in result, f"Response missing required field: {field}"
+            missing = set(fields).difference(response['result'])
+            assert not missing, f"Response missing required fields: {sorted(missing)}"
                 
+    def assert_ok(self, response: Dict[str, Any], *fields, expected: bool = True) -> Dict[str, Any]:
+        """Assert the result's success flag and required fields in one pass; returns the result"""
+        result = response.get('result')
+        assert result is not None, f"Unexpected error in response: {response}"
+        success = result['success']
+        assert success is expected, f"Expected success={expected}, got success={success}"
+        if fields:
+            missing = set(fields).difference(result)
+            assert not missing, f"Response missing required fields: {sorted(missing)}"
+        if not expected and 'error' in result:
+            self.log(f"Expected error: {result['error']}")
+        return result
+        
     def run_test(self, test_func):
-        """Run a test function with setup and teardown"""
-        print(f"\n🧪 Running test: {test_func.__name__}")
+        """Run a test function with setup and teardown, emitting its output in one write"""
+        return self._run_buffered(test_func, connect=True)
+        
+    def _run_buffered(self, test_func, connect: bool) -> bool:
+        """Run a test function, optionally inside its own setup/teardown, with buffered output"""
+        self.log_buffer = io.StringIO()
+        self.log(f"\n🧪 Running test: {test_func.__name__}")
+        passed = False
         try:
-            if not self.setup():
-                print("✗ Test setup failed")
+            if connect and not self.setup():
+                self.log("✗ Test setup failed")
                 return False
                 
             test_func()
-            print(f"✅ Test {test_func.__name__} passed")
+            passed = True
+            self.log(f"✅ Test {test_func.__name__} passed")
             return True
             
         except Exception as e:
-            print(f"❌ Test {test_func.__name__} failed: {e}")
+            self.log(f"❌ Test {test_func.__name__} failed: {e}")
             return False
         finally:
-            self.teardown()
+            if connect:
+                self.teardown()
+            output, self.log_buffer = self.log_buffer.getvalue(), None
+            if passed and not self.verbose:
+                output = f"✅ Test {test_func.__name__} passed\n"
+            _write_output(output)
+            
+    def discover_tests(self) -> list:
+        """Return this object's bound test_* methods in source definition order"""
+        cls = type(self)
+        names = self._discovered_tests.get(cls)
+        if names is None:
+            members = inspect.getmembers(
+                cls, lambda member: inspect.isfunction(member) and member.__name__.startswith('test_'))
+            members.sort(key=lambda item: item[1].__code__.co_firstlineno)
+            names = self._discovered_tests[cls] = tuple(name for name, _ in members)
+        return [getattr(self, name) for name in names]
+        
+    def run_tests(self, tests, max_workers: int = 8):
+        """Run test methods concurrently, each on its own client so replies never cross.
+
+        Every pool thread connects one client on first use and keeps it for
+        all the tests it runs; the clients disconnect once the run is over.
+        A thread whose client could not connect fails its tests without retrying.
+        """
+        if not tests:
+            return []
+            
+        local = threading.local()
+        workers = []
+        
+        def run_one(test_func):
+            worker = getattr(local, 'worker', None)
+            if worker is None:
+                worker = local.worker = type(self)(self.broker_host, self.broker_port)
+                workers.append(worker)
+                local.connected = worker.setup()
+            if not local.connected:
+                _write_output(f"❌ Test {test_func.__name__} failed: could not connect to MQTT broker\n")
+                return False
+            return worker._run_buffered(getattr(worker, test_func.__name__), connect=False)
+            
+        try:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(tests))) as executor:
+                return list(executor.map(run_one, tests))
+        finally:
+            for worker in workers:
+                worker.teardown()
+
+def _make_sender(method: str, required: Tuple[str, ...], optional: Tuple[str, ...]):
+    """Generate send_<method>(self, ...) for a fixed request shape.
+
+    The method name and parameter keys are encoded once here; a call only
+    serializes its argument values and skips building the request dict.
+    Optional parameters left as None are omitted, as with a missing key.
+    """
+    name = "send_" + method.replace("-", "_")
+    namespace = {
+        "_dumps": _json_dumps,
+        "_METHOD": method,
+        "_HEAD": _REQUEST_HEAD + _json_dumps(method) + b',"params":{',
+        "_TAIL": b'},"id":',
+    }
+    args = list(required) + [f"{param}=None" for param in optional]
+    lines = []
+    if required:
+        # Required keys come first, so every key after index 0 follows an emitted one
+        for i, param in enumerate(required + optional):
+            namespace[f"_K{i}"] = (b',' if i else b'') + _json_dumps(param) + b':'
+            if param in required:
+                lines.append(f"    body += (_K{i}, _dumps({param}))")
+            else:
+                lines.append(f"    if {param} is not None:")
+                lines.append(f"        body += (_K{i}, _dumps({param}))")
+    elif optional:
+        # Any optional key may be the first one emitted; the separator is decided per call
+        lines.append("    sep = b''")
+        for i, param in enumerate(optional):
+            namespace[f"_K{i}"] = _json_dumps(param) + b':'
+            lines.append(f"    if {param} is not None:")
+            lines.append(f"        body += (sep, _K{i}, _dumps({param}))")
+            lines.append("        sep = b','")
+            
+    # Only the response cache and instance-cache invalidation need the params dict
+    if method in READ_ONLY_METHODS or method == "delete":
+        lines.append("    params = {" + ", ".join(f"{param!r}: {param}" for param in required) + "}")
+        for param in optional:
+            lines.append(f"    if {param} is not None:")
+            lines.append(f"        params[{param!r}] = {param}")
+        params = "params"
+    else:
+        params = "None"
+        
+    source = "\n".join([
+        f"def {name}(self, {', '.join(args)}):",
+        "    body = [_HEAD]",
+        *lines,
+        "    body.append(_TAIL)",
+        f"    return self._raw_send(_METHOD, body, {params})",
+    ])
+    exec(source, namespace)
+    sender = namespace[name]
+    sender.__qualname__ = f"BaseRPCTest.{name}"
+    sender.__doc__ = f"Send a '{method}' request and wait for the response"
+    return sender
+
+
+for _method, (_required, _optional) in SPECIALIZED_METHODS.items():
+    _sender = _make_sender(_method, _required, _optional)
+    setattr(BaseRPCTest, _sender.__name__, _sender)
+
+
+_shared_client: Optional[BaseRPCTest] = None
+_shared_client_lock = threading.Lock()
+
+def shared_client(log_buffer: Optional[io.StringIO] = None,
+                  verbose: Optional[bool] = None) -> Optional[BaseRPCTest]:
+    """Connected client shared by the single-shot test_<operation>() helpers.
+
+    Connects on first use and disconnects at interpreter exit, so a process
+    calling several helpers pays for one broker connection. Returns None
+    when the broker cannot be reached; the next call retries. When given,
+    log_buffer collects the connection output instead of stdout, and
+    verbose overrides VPN_TEST_VERBOSE for the client being created.
+    """
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            client = BaseRPCTest(log_buffer=log_buffer, verbose=verbose)
+            connected = client.setup()
+            client.log_buffer = None
+            if not connected:
+                return None
+            atexit.register(client.teardown)
+            _shared_client = client
+        return _shared_client
@@ -112,6 +112,12 @@ def check_dependencies():
         print("❌ paho-mqtt not installed. Install with: pip install paho-mqtt")
         return False
         
+    try:
+        import orjson
+        print("✅ orjson codec available")
+    except ImportError:
+        print("⚠️  orjson not installed, falling back to stdlib json (pip install orjson)")
+        
     try:
         import subprocess
         print("✅ subprocess module available")
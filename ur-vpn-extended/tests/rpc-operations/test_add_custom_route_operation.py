@@ -4,19 +4,66 @@ Test RPC operation: add-custom-route
 Add a custom routing rule
 """
 
-import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import sys
+
+from base_rpc_test import BaseRPCTest, encode_request, ErrorCode, MISSING_REQUIRED_FIELDS
 
-from base_rpc_test import BaseRPCTest
+# Fixed negative-test requests, encoded once at import
+_ADD_CUSTOM_ROUTE_MISSING_ID_REQUEST = encode_request("add-custom-route", {
+    "vpn_instance": "test_instance",
+    "destination": "192.168.1.0/24"
+})
+_ADD_CUSTOM_ROUTE_MISSING_VPN_INSTANCE_REQUEST = encode_request("add-custom-route", {
+    "id": "test_route",
+    "destination": "192.168.1.0/24"
+})
+_ADD_CUSTOM_ROUTE_MISSING_DESTINATION_REQUEST = encode_request("add-custom-route", {
+    "id": "test_route",
+    "vpn_instance": "test_instance"
+})
+
+# Route fixtures, built once at import; tests only read them. Their ids carry
+# the process id so concurrent runs never share a route on the server
+_CUSTOM_ROUTE_ID = f"custom_route_{os.getpid()}"
+_MINIMAL_ROUTE_ID = f"minimal_route_{os.getpid()}"
+_DUPLICATE_ROUTE = {
+    "id": f"duplicate_route_test_{os.getpid()}",
+    "vpn_instance": "test_instance",
+    "destination": "192.168.1.0/24"
+}
+_FULL_ROUTE = {
+    "id": f"full_route_{os.getpid()}",
+    "name": "Complete Route",
+    "vpn_instance": "test_instance",
+    "vpn_profile": "default",
+    "source_type": "IP",
+    "source_value": "192.168.1.100",
+    "destination": "172.16.0.0/16",
+    "gateway": "Custom Gateway",
+    "protocol": "tcp",
+    "type": "split_tunnel",
+    "priority": 50,
+    "enabled": True,
+    "log_traffic": True,
+    "apply_to_existing": True,
+    "description": "Complete test route",
+    "created_date": "2023-01-01",
+    "last_modified": "2023-01-01",
+    "is_automatic": False,
+    "user_modified": True
+}
 
 class TestAddCustomRouteOperation(BaseRPCTest):
     """Test add-custom-route operation"""
     
+    __slots__ = ()
+    
     def test_add_custom_route(self):
         """Test adding a custom routing rule"""
+        self.add_cleanup("delete-custom-route", {"id": _CUSTOM_ROUTE_ID})
         response = self.send_rpc_request("add-custom-route", {
-            "id": "custom_route_001",
+            "id": _CUSTOM_ROUTE_ID,
             "name": "Test Route",
             "vpn_instance": "test_instance",
             "destination": "192.168.1.0/24",
@@ -26,136 +73,84 @@ class TestAddCustomRouteOperation(BaseRPCTest):
             "description": "Test custom route"
         })
         
-        self.assert_success(response)
-        self.assert_contains_fields(response, "success", "message")
-        
-        result = response['result']
-        assert result['success'] == True
+        result = self.assert_ok(response, "message")
         assert "added successfully" in result['message']
         
-        print(f"✓ Custom route added: {result['message']}")
+        self.log(f"✓ Custom route added: {result['message']}")
         
     def test_add_custom_route_minimal(self):
         """Test adding a custom route with minimal required fields"""
+        self.add_cleanup("delete-custom-route", {"id": _MINIMAL_ROUTE_ID})
         response = self.send_rpc_request("add-custom-route", {
-            "id": "minimal_route_001",
+            "id": _MINIMAL_ROUTE_ID,
             "vpn_instance": "test_instance",
             "destination": "10.0.0.0/8"
         })
         
-        self.assert_success(response)
+        result = self.assert_ok(response)
         
-        result = response['result']
-        assert result['success'] == True
-        
-        print(f"✓ Minimal custom route added: {result['message']}")
+        self.log(f"✓ Minimal custom route added: {result['message']}")
         
     def test_add_custom_route_missing_id(self):
         """Test adding custom route without id"""
-        response = self.send_rpc_request("add-custom-route", {
-            "vpn_instance": "test_instance",
-            "destination": "192.168.1.0/24"
-        })
+        response = self.send_encoded(_ADD_CUSTOM_ROUTE_MISSING_ID_REQUEST)
         
-        self.assert_success(response, expected_success=False)
-        assert "Missing required fields" in response['result']['error']
+        result = self.assert_ok(response, expected=False)
+        assert result['code'] == ErrorCode.MISSING_PARAM
+        assert result['error'].startswith(MISSING_REQUIRED_FIELDS)
         
-        print(f"✓ Missing id correctly rejected: {response['result']['error']}")
+        self.log(f"✓ Missing id correctly rejected: {result['error']}")
         
     def test_add_custom_route_missing_vpn_instance(self):
         """Test adding custom route without vpn_instance"""
-        response = self.send_rpc_request("add-custom-route", {
-            "id": "test_route",
-            "destination": "192.168.1.0/24"
-        })
+        response = self.send_encoded(_ADD_CUSTOM_ROUTE_MISSING_VPN_INSTANCE_REQUEST)
         
-        self.assert_success(response, expected_success=False)
-        assert "Missing required fields" in response['result']['error']
+        result = self.assert_ok(response, expected=False)
+        assert result['code'] == ErrorCode.MISSING_PARAM
+        assert result['error'].startswith(MISSING_REQUIRED_FIELDS)
         
-        print(f"✓ Missing vpn_instance correctly rejected: {response['result']['error']}")
+        self.log(f"✓ Missing vpn_instance correctly rejected: {result['error']}")
         
     def test_add_custom_route_missing_destination(self):
         """Test adding custom route without destination"""
-        response = self.send_rpc_request("add-custom-route", {
-            "id": "test_route",
-            "vpn_instance": "test_instance"
-        })
+        response = self.send_encoded(_ADD_CUSTOM_ROUTE_MISSING_DESTINATION_REQUEST)
         
-        self.assert_success(response, expected_success=False)
-        assert "Missing required fields" in response['result']['error']
+        result = self.assert_ok(response, expected=False)
+        assert result['code'] == ErrorCode.MISSING_PARAM
+        assert result['error'].startswith(MISSING_REQUIRED_FIELDS)
         
-        print(f"✓ Missing destination correctly rejected: {response['result']['error']}")
+        self.log(f"✓ Missing destination correctly rejected: {result['error']}")
         
     def test_add_duplicate_custom_route(self):
         """Test adding duplicate custom route ID"""
-        route_data = {
-            "id": "duplicate_route_test",
-            "vpn_instance": "test_instance",
-            "destination": "192.168.1.0/24"
-        }
-        
         # Add first route
-        self.send_rpc_request("add-custom-route", route_data)
+        self.add_custom_routes([_DUPLICATE_ROUTE])
         
         # Try to add duplicate
-        response = self.send_rpc_request("add-custom-route", route_data)
+        response = self.send_rpc_request("add-custom-route", _DUPLICATE_ROUTE)
         
         # Should fail
-        self.assert_success(response, expected_success=False)
+        result = self.assert_ok(response, expected=False)
         
-        print(f"✓ Duplicate route correctly rejected: {response['result']['error']}")
+        self.log(f"✓ Duplicate route correctly rejected: {result['error']}")
         
     def test_add_custom_route_all_parameters(self):
         """Test adding custom route with all possible parameters"""
-        response = self.send_rpc_request("add-custom-route", {
-            "id": "full_route_001",
-            "name": "Complete Route",
-            "vpn_instance": "test_instance",
-            "vpn_profile": "default",
-            "source_type": "IP",
-            "source_value": "192.168.1.100",
-            "destination": "172.16.0.0/16",
-            "gateway": "Custom Gateway",
-            "protocol": "tcp",
-            "type": "split_tunnel",
-            "priority": 50,
-            "enabled": True,
-            "log_traffic": True,
-            "apply_to_existing": True,
-            "description": "Complete test route",
-            "created_date": "2023-01-01",
-            "last_modified": "2023-01-01",
-            "is_automatic": False,
-            "user_modified": True
-        })
+        self.add_cleanup("delete-custom-route", {"id": _FULL_ROUTE["id"]})
+        response = self.send_rpc_request("add-custom-route", _FULL_ROUTE)
         
-        self.assert_success(response)
+        result = self.assert_ok(response)
         
-        result = response['result']
-        assert result['success'] == True
-        
-        print(f"✓ Full parameter custom route added: {result['message']}")
+        self.log(f"✓ Full parameter custom route added: {result['message']}")
 
 def main():
     """Run add-custom-route operation tests"""
     test = TestAddCustomRouteOperation()
     
-    tests = [
-        test.test_add_custom_route,
-        test.test_add_custom_route_minimal,
-        test.test_add_custom_route_missing_id,
-        test.test_add_custom_route_missing_vpn_instance,
-        test.test_add_custom_route_missing_destination,
-        test.test_add_duplicate_custom_route,
-        test.test_add_custom_route_all_parameters
-    ]
+    tests = test.discover_tests()
     
-    passed = 0
+    passed = sum(test.run_tests(tests))
     total = len(tests)
-    
-    for test_func in tests:
-        if test.run_test(test_func):
-            passed += 1
             
     print(f"\n📊 Add Custom Route Operation Tests Results: {passed}/{total} passed")
     return passed == total
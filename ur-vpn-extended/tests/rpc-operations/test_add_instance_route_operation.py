@@ -5,30 +5,25 @@ Add a route rule to a specific instance
 """
 
 import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from base_rpc_test import BaseRPCTest
+from base_rpc_test import BaseRPCTest, encode_request, DEFAULT_OVPN_CLIENT_CONFIG, ErrorCode, MISSING_INSTANCE_NAME, MISSING_ROUTE_RULE
+
+# Fixed negative-test requests, encoded once at import
+_ADD_MISSING_ROUTE_RULE_REQUEST = encode_request("add-instance-route", {
+    "instance_name": "test_instance"
+})
 
 class TestAddInstanceRouteOperation(BaseRPCTest):
     """Test add-instance-route operation"""
     
+    __slots__ = ()
+    
     def test_add_instance_route(self):
         """Test adding a route to a specific instance"""
+        instance_name = self.unique_name("add_route_instance")
+        
         # Add an instance first
-        config_content = """
-client
-dev tun
-proto udp
-remote 127.0.0.1 1194
-        """.strip()
-        
-        self.send_rpc_request("add", {
-            "instance_name": "add_route_instance",
-            "config_content": config_content,
-            "vpn_type": "openvpn",
-            "auto_start": False
-        })
+        self.ensure_instance(instance_name, DEFAULT_OVPN_CLIENT_CONFIG)
         
         # Add route to instance
         route_rule = {
@@ -38,17 +33,11 @@ remote 127.0.0.1 1194
             "priority": 100
         }
         
-        response = self.send_rpc_request("add-instance-route", {
-            "instance_name": "add_route_instance",
-            "route_rule": route_rule
-        })
-        
-        self.assert_success(response)
+        response = self.send_add_instance_route(instance_name, route_rule)
         
-        result = response['result']
-        assert result['success'] == True
+        result = self.assert_ok(response)
         
-        print(f"✓ Instance route added successfully")
+        self.log(f"✓ Instance route added successfully")
         
     def test_add_missing_instance_name(self):
         """Test adding route without instance_name"""
@@ -61,27 +50,21 @@ remote 127.0.0.1 1194
             "route_rule": route_rule
         })
         
-        self.assert_success(response, expected_success=False)
-        
-        result = response['result']
-        assert result['success'] == False
-        assert "Missing 'instance_name'" in result['error']
+        result = self.assert_ok(response, expected=False)
+        assert result['code'] == ErrorCode.MISSING_PARAM
+        assert result['error'].startswith(MISSING_INSTANCE_NAME)
         
-        print(f"✓ Missing instance_name correctly rejected: {result['error']}")
+        self.log(f"✓ Missing instance_name correctly rejected: {result['error']}")
         
     def test_add_missing_route_rule(self):
         """Test adding route without route_rule"""
-        response = self.send_rpc_request("add-instance-route", {
-            "instance_name": "test_instance"
-        })
+        response = self.send_encoded(_ADD_MISSING_ROUTE_RULE_REQUEST)
         
-        self.assert_success(response, expected_success=False)
+        result = self.assert_ok(response, expected=False)
+        assert result['code'] == ErrorCode.MISSING_PARAM
+        assert result['error'].startswith(MISSING_ROUTE_RULE)
         
-        result = response['result']
-        assert result['success'] == False
-        assert "Missing 'route_rule'" in result['error']
-        
-        print(f"✓ Missing route_rule correctly rejected: {result['error']}")
+        self.log(f"✓ Missing route_rule correctly rejected: {result['error']}")
         
     def test_add_route_nonexistent_instance(self):
         """Test adding route to non-existent instance"""
@@ -90,29 +73,18 @@ remote 127.0.0.1 1194
             "destination": "192.168.1.0/24"
         }
         
-        response = self.send_rpc_request("add-instance-route", {
-            "instance_name": "nonexistent_instance",
-            "route_rule": route_rule
-        })
-        
-        self.assert_success(response, expected_success=False)
+        response = self.send_add_instance_route("nonexistent_instance", route_rule)
         
-        result = response['result']
-        assert result['success'] == False
+        result = self.assert_ok(response, expected=False)
         
-        print(f"✓ Non-existent instance correctly rejected: {result['error']}")
+        self.log(f"✓ Non-existent instance correctly rejected: {result['error']}")
         
     def test_add_duplicate_route_to_instance(self):
         """Test adding duplicate route to same instance"""
-        # Add instance
-        config_content = "client\ndev tun\nproto udp\nremote 127.0.0.1 1194"
+        instance_name = self.unique_name("duplicate_route_instance")
         
-        self.send_rpc_request("add", {
-            "instance_name": "duplicate_route_instance",
-            "config_content": config_content,
-            "vpn_type": "openvpn",
-            "auto_start": False
-        })
+        # Add instance
+        self.ensure_instance(instance_name, DEFAULT_OVPN_CLIENT_CONFIG)
         
         route_rule = {
             "id": "duplicate_route",
@@ -120,34 +92,23 @@ remote 127.0.0.1 1194
         }
         
         # Add first route
-        response1 = self.send_rpc_request("add-instance-route", {
-            "instance_name": "duplicate_route_instance",
-            "route_rule": route_rule
-        })
-        assert response1['result']['success']
+        response1 = self.send_add_instance_route(instance_name, route_rule)
+        self.assert_ok(response1)
         
         # Try to add duplicate
-        response2 = self.send_rpc_request("add-instance-route", {
-            "instance_name": "duplicate_route_instance",
-            "route_rule": route_rule
-        })
+        response2 = self.send_add_instance_route(instance_name, route_rule)
         
         # Should fail
-        self.assert_success(response2, expected_success=False)
+        result = self.assert_ok(response2, expected=False)
         
-        print(f"✓ Duplicate route correctly rejected: {response2['result']['error']}")
+        self.log(f"✓ Duplicate route correctly rejected: {result['error']}")
         
     def test_add_multiple_routes_to_instance(self):
         """Test adding multiple routes to same instance"""
-        # Add instance
-        config_content = "client\ndev tun\nproto udp\nremote 127.0.0.1 1194"
+        instance_name = self.unique_name("multi_route_instance")
         
-        self.send_rpc_request("add", {
-            "instance_name": "multi_route_instance",
-            "config_content": config_content,
-            "vpn_type": "openvpn",
-            "auto_start": False
-        })
+        # Add instance
+        self.ensure_instance(instance_name, DEFAULT_OVPN_CLIENT_CONFIG)
         
         # Add multiple routes
         routes = [
@@ -157,36 +118,23 @@ remote 127.0.0.1 1194
         ]
         
         added_count = 0
+        add_route = self.send_add_instance_route
         for route in routes:
-            response = self.send_rpc_request("add-instance-route", {
-                "instance_name": "multi_route_instance",
-                "route_rule": route
-            })
+            response = add_route(instance_name, route)
             
             if response['result']['success']:
                 added_count += 1
                 
-        print(f"✓ Added {added_count}/{len(routes)} routes to instance")
+        self.log(f"✓ Added {added_count}/{len(routes)} routes to instance")
 
 def main():
     """Run add-instance-route operation tests"""
     test = TestAddInstanceRouteOperation()
     
-    tests = [
-        test.test_add_instance_route,
-        test.test_add_missing_instance_name,
-        test.test_add_missing_route_rule,
-        test.test_add_route_nonexistent_instance,
-        test.test_add_duplicate_route_to_instance,
-        test.test_add_multiple_routes_to_instance
-    ]
+    tests = test.discover_tests()
     
-    passed = 0
+    passed = sum(test.run_tests(tests))
     total = len(tests)
-    
-    for test_func in tests:
-        if test.run_test(test_func):
-            passed += 1
             
     print(f"\n📊 Add Instance Route Operation Tests Results: {passed}/{total} passed")
     return passed == total
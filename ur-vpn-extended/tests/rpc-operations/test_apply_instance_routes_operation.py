@@ -5,68 +5,53 @@ Apply routing rules for a specific instance
 """
 
 import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from base_rpc_test import BaseRPCTest
+from base_rpc_test import BaseRPCTest, encode_request, DEFAULT_OVPN_CLIENT_CONFIG, ErrorCode, MISSING_INSTANCE_NAME
+
+# Fixed negative-test requests, encoded once at import
+_APPLY_MISSING_INSTANCE_NAME_REQUEST = encode_request("apply-instance-routes", {})
+_APPLY_EMPTY_INSTANCE_NAME_REQUEST = encode_request("apply-instance-routes", {"instance_name": ""})
 
 class TestApplyInstanceRoutesOperation(BaseRPCTest):
     """Test apply-instance-routes operation"""
     
+    __slots__ = ()
+    
     def test_apply_instance_routes(self):
         """Test applying routes for a specific instance"""
+        instance_name = self.unique_name("apply_routes_instance")
+        
         # Add an instance
-        config_content = """
-client
-dev tun
-proto udp
-remote 127.0.0.1 1194
-        """.strip()
-        
-        self.send_rpc_request("add", {
-            "instance_name": "apply_routes_instance",
-            "config_content": config_content,
-            "vpn_type": "openvpn",
-            "auto_start": False
-        })
+        self.ensure_instance(instance_name, DEFAULT_OVPN_CLIENT_CONFIG)
         
         # Apply routes
         response = self.send_rpc_request("apply-instance-routes", {
-            "instance_name": "apply_routes_instance"
+            "instance_name": instance_name
         })
         
-        self.assert_success(response)
-        
-        result = response['result']
-        assert result['success'] == True
+        result = self.assert_ok(response)
         
-        print(f"✓ Instance routes applied successfully")
+        self.log(f"✓ Instance routes applied successfully")
         
     def test_apply_missing_instance_name(self):
         """Test applying routes without instance_name"""
-        response = self.send_rpc_request("apply-instance-routes", {})
-        
-        self.assert_success(response, expected_success=False)
+        response = self.send_encoded(_APPLY_MISSING_INSTANCE_NAME_REQUEST)
         
-        result = response['result']
-        assert result['success'] == False
-        assert "Missing 'instance_name'" in result['error']
+        result = self.assert_ok(response, expected=False)
+        assert result['code'] == ErrorCode.MISSING_PARAM
+        assert result['error'].startswith(MISSING_INSTANCE_NAME)
         
-        print(f"✓ Missing instance_name correctly rejected: {result['error']}")
+        self.log(f"✓ Missing instance_name correctly rejected: {result['error']}")
         
     def test_apply_empty_instance_name(self):
         """Test applying routes with empty instance_name"""
-        response = self.send_rpc_request("apply-instance-routes", {
-            "instance_name": ""
-        })
-        
-        self.assert_success(response, expected_success=False)
+        response = self.send_encoded(_APPLY_EMPTY_INSTANCE_NAME_REQUEST)
         
-        result = response['result']
-        assert result['success'] == False
-        assert "Missing 'instance_name'" in result['error']
+        result = self.assert_ok(response, expected=False)
+        assert result['code'] == ErrorCode.MISSING_PARAM
+        assert result['error'].startswith(MISSING_INSTANCE_NAME)
         
-        print(f"✓ Empty instance_name correctly rejected: {result['error']}")
+        self.log(f"✓ Empty instance_name correctly rejected: {result['error']}")
         
     def test_apply_nonexistent_instance_routes(self):
         """Test applying routes for non-existent instance"""
@@ -74,24 +59,16 @@ remote 127.0.0.1 1194
             "instance_name": "nonexistent_instance"
         })
         
-        self.assert_success(response, expected_success=False)
+        result = self.assert_ok(response, expected=False)
         
-        result = response['result']
-        assert result['success'] == False
-        
-        print(f"✓ Non-existent instance routes apply correctly rejected: {result['error']}")
+        self.log(f"✓ Non-existent instance routes apply correctly rejected: {result['error']}")
         
     def test_apply_routes_with_existing_routes(self):
         """Test applying routes for instance with existing routes"""
-        # Add instance
-        config_content = "client\ndev tun\nproto udp\nremote 127.0.0.1 1194"
+        instance_name = self.unique_name("apply_existing_routes")
         
-        self.send_rpc_request("add", {
-            "instance_name": "apply_existing_routes",
-            "config_content": config_content,
-            "vpn_type": "openvpn",
-            "auto_start": False
-        })
+        # Add instance
+        self.ensure_instance(instance_name, DEFAULT_OVPN_CLIENT_CONFIG)
         
         # Add some routes
         routes = [
@@ -99,93 +76,63 @@ remote 127.0.0.1 1194
             {"id": "apply_route_2", "destination": "10.0.0.0/8"}
         ]
         
-        for route in routes:
-            self.send_rpc_request("add-instance-route", {
-                "instance_name": "apply_existing_routes",
-                "route_rule": route
-            })
+        self.send_rpc_batch([("add-instance-route", {"instance_name": instance_name, "route_rule": route})
+                             for route in routes])
         
         # Apply routes
         response = self.send_rpc_request("apply-instance-routes", {
-            "instance_name": "apply_existing_routes"
+            "instance_name": instance_name
         })
         
-        self.assert_success(response)
-        
-        result = response['result']
-        assert result['success'] == True
+        result = self.assert_ok(response)
         
-        print(f"✓ Routes applied for instance with existing routes")
+        self.log(f"✓ Routes applied for instance with existing routes")
         
     def test_apply_routes_multiple_times(self):
         """Test applying routes multiple times"""
-        # Add instance
-        config_content = "client\ndev tun\nproto udp\nremote 127.0.0.1 1194"
+        instance_name = self.unique_name("apply_multiple_times")
         
-        self.send_rpc_request("add", {
-            "instance_name": "apply_multiple_times",
-            "config_content": config_content,
-            "vpn_type": "openvpn",
-            "auto_start": False
-        })
+        # Add instance
+        self.ensure_instance(instance_name, DEFAULT_OVPN_CLIENT_CONFIG)
         
         # Apply routes multiple times
+        send = self.send_rpc_request
         for i in range(3):
-            response = self.send_rpc_request("apply-instance-routes", {
-                "instance_name": "apply_multiple_times"
+            response = send("apply-instance-routes", {
+                "instance_name": instance_name
             })
             
             if response['result']['success']:
-                print(f"✓ Route application {i+1} successful")
+                self.log(f"✓ Route application {i+1} successful")
             else:
-                print(f"⚠️ Route application {i+1} failed: {response['result']}")
+                self.log(f"⚠️ Route application {i+1} failed: {response['result']}")
         
     def test_apply_routes_with_parameters(self):
         """Test applying routes with extra parameters"""
-        # Add instance
-        config_content = "client\ndev tun\nproto udp\nremote 127.0.0.1 1194"
+        instance_name = self.unique_name("apply_with_params")
         
-        self.send_rpc_request("add", {
-            "instance_name": "apply_with_params",
-            "config_content": config_content,
-            "vpn_type": "openvpn",
-            "auto_start": False
-        })
+        # Add instance
+        self.ensure_instance(instance_name, DEFAULT_OVPN_CLIENT_CONFIG)
         
         # Apply routes with extra parameters
         response = self.send_rpc_request("apply-instance-routes", {
-            "instance_name": "apply_with_params",
+            "instance_name": instance_name,
             "force": True,
             "dry_run": False
         })
         
-        self.assert_success(response)
+        result = self.assert_ok(response)
         
-        result = response['result']
-        assert result['success'] == True
-        
-        print(f"✓ Routes applied with extra parameters")
+        self.log(f"✓ Routes applied with extra parameters")
 
 def main():
     """Run apply-instance-routes operation tests"""
     test = TestApplyInstanceRoutesOperation()
     
-    tests = [
-        test.test_apply_instance_routes,
-        test.test_apply_missing_instance_name,
-        test.test_apply_empty_instance_name,
-        test.test_apply_nonexistent_instance_routes,
-        test.test_apply_routes_with_existing_routes,
-        test.test_apply_routes_multiple_times,
-        test.test_apply_routes_with_parameters
-    ]
+    tests = test.discover_tests()
     
-    passed = 0
+    passed = sum(test.run_tests(tests))
     total = len(tests)
-    
-    for test_func in tests:
-        if test.run_test(test_func):
-            passed += 1
             
     print(f"\n📊 Apply Instance Routes Operation Tests Results: {passed}/{total} passed")
     return passed == total
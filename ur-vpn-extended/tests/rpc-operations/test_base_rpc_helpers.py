@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Offline checks of the BaseRPCTest helpers (no MQTT broker or ur-vpn-manager needed)
+Usage: python test_base_rpc_helpers.py
+"""
+
+import os
+import sys
+import tempfile
+
+from base_rpc_test import BaseRPCTest, DEFAULT_OVPN_CLIENT_CONFIG, json_loads, load_config_file, _make_sender
+
+# Generated sender for a request shape whose parameters are all optional
+_send_all_optional = _make_sender("all-optional", (), ("first", "second", "third"))
+
+class RecordingClient(BaseRPCTest):
+    """BaseRPCTest whose requests are decoded and answered locally instead of published"""
+    
+    __slots__ = ('sent',)
+    
+    def __init__(self):
+        super().__init__()
+        self.sent = []
+    
+    def _publish_and_wait(self, request_id, request_json):
+        request = json_loads(request_json)
+        if isinstance(request, list):
+            self.sent.extend(request)
+            return [{"jsonrpc": "2.0", "id": entry["id"], "result": {"success": True}} for entry in request]
+        self.sent.append(request)
+        return {"jsonrpc": "2.0", "id": request_id, "result": {"success": True}}
+    
+    def sent_methods(self):
+        """Methods of the recorded requests, batch entries included"""
+        return [request["method"] for request in self.sent]
+
+class TestBaseRPCHelpers(RecordingClient):
+    """Test the request encoding and fixture helpers of BaseRPCTest"""
+    
+    __slots__ = ()
+    
+    def test_ensure_instance_reuses_fixture(self):
+        """Test that a repeated ensure_instance() skips the 'add' until the instance is deleted"""
+        instance_name = self.unique_name("cached_fixture")
+        
+        self.assert_ok(self.ensure_instance(instance_name, DEFAULT_OVPN_CLIENT_CONFIG))
+        self.assert_ok(self.ensure_instance(instance_name, DEFAULT_OVPN_CLIENT_CONFIG))
+        assert self.sent_methods() == ["add"], f"Expected one 'add', sent {self.sent_methods()}"
+        
+        # A successful delete, single or batched, drops the cached fixture
+        self.assert_ok(self.send_delete(instance_name))
+        self.assert_ok(self.ensure_instance(instance_name, DEFAULT_OVPN_CLIENT_CONFIG))
+        self.send_rpc_batch([("delete", {"instance_name": instance_name})])
+        self.assert_ok(self.ensure_instance(instance_name, DEFAULT_OVPN_CLIENT_CONFIG))
+        
+        assert self.sent_methods() == ["add", "delete", "add", "delete", "add"], \
+            f"Unexpected requests: {self.sent_methods()}"
+        
+        self.log(f"✓ Fixture reused until deleted: {self.sent_methods()}")
+
+    def test_all_optional_sender(self):
+        """Test that a generated sender with only optional params encodes every subset as valid JSON"""
+        calls = [{}, {"first": 1}, {"second": "b"}, {"third": [3]}, {"second": "b", "third": [3]},
+                 {"first": 1, "second": "b", "third": [3]}]
+        for kwargs in calls:
+            _send_all_optional(self, **kwargs)
+            
+        sent_params = [request["params"] for request in self.sent]
+        assert sent_params == calls, f"Unexpected params: {sent_params}"
+        
+        self.log(f"✓ All {len(calls)} optional-param combinations encoded correctly")
+
+    def test_config_newlines_normalized(self):
+        """Test that CRLF and CR config files read back with the newlines of a text-mode read"""
+        for newline in ("\r\n", "\r"):
+            with tempfile.NamedTemporaryFile('wb', suffix='.ovpn', delete=False) as f:
+                f.write(DEFAULT_OVPN_CLIENT_CONFIG.replace("\n", newline).encode('utf-8') + newline.encode())
+            try:
+                content = load_config_file(f.name)
+            finally:
+                os.unlink(f.name)
+            assert content == DEFAULT_OVPN_CLIENT_CONFIG + "\n", f"Unexpected content: {content!r}"
+            
+        self.log("✓ CRLF and CR config files read with normalized newlines")
+
+def main():
+    """Run the offline BaseRPCTest helper tests"""
+    test = TestBaseRPCHelpers()
+    
+    tests = test.discover_tests()
+    
+    passed = 0
+    for test_func in tests:
+        test.sent.clear()
+        passed += test._run_buffered(test_func, connect=False)
+    total = len(tests)
+    
+    print(f"\n📊 Base RPC Helper Tests Results: {passed}/{total} passed")
+    return passed == total
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
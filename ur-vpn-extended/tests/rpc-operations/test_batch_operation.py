@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Test RPC operation: JSON-RPC batch handling
+Requests sent as one JSON array and answered together
+"""
+
+import sys
+
+from base_rpc_test import BaseRPCTest
+
+class TestBatchOperation(BaseRPCTest):
+    """Test JSON-RPC batch handling"""
+    
+    __slots__ = ()
+    
+    def test_empty_batch(self):
+        """Test that an empty batch is answered with a published error whose id is null"""
+        response = self.send_raw_request(b'[]')
+        
+        assert isinstance(response, dict), f"Expected a single error object, got {response}"
+        assert 'id' in response and response['id'] is None, f"Expected \"id\": null, got {response.get('id')!r}"
+        assert 'error' in response, f"Expected an error response, got {response}"
+        assert response['error']['message'] == "Empty batch request"
+        
+        self.log(f"✓ Empty batch correctly rejected: {response['error']['message']}")
+
+def main():
+    """Run batch handling tests"""
+    test = TestBatchOperation()
+    
+    tests = test.discover_tests()
+    
+    passed = sum(test.run_tests(tests))
+    total = len(tests)
+    
+    print(f"\n📊 Batch Operation Tests Results: {passed}/{total} passed")
+    return passed == total
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
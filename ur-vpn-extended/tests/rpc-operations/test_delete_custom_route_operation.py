@@ -4,38 +4,51 @@ Test RPC operation: delete-custom-route
 Delete a custom routing rule
 """
 
-import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import sys
+
+from base_rpc_test import BaseRPCTest, encode_request, ErrorCode, MISSING_ID
+
+# Fixed negative-test requests, encoded once at import
+_DELETE_MISSING_ID_REQUEST = encode_request("delete-custom-route", {})
+_DELETE_EMPTY_ID_REQUEST = encode_request("delete-custom-route", {"id": ""})
 
-from base_rpc_test import BaseRPCTest
+# Route fixtures, built once at import; tests only read them. Their ids carry
+# the process id so concurrent runs never share a route on the server
+_DELETE_TEST_ROUTE = {
+    "id": f"delete_test_route_{os.getpid()}",
+    "vpn_instance": "test_instance",
+    "destination": "192.168.100.0/24"
+}
+_MULTI_DELETE_ROUTES = [
+    {"id": f"multi_delete_{i}_{os.getpid()}", "vpn_instance": "test_instance", "destination": f"192.168.{i}.0/24"}
+    for i in (1, 2, 3)
+]
+_ALREADY_DELETED_ROUTE = {
+    "id": f"already_deleted_route_{os.getpid()}",
+    "vpn_instance": "test_instance",
+    "destination": "192.168.200.0/24"
+}
 
 class TestDeleteCustomRouteOperation(BaseRPCTest):
     """Test delete-custom-route operation"""
     
+    __slots__ = ()
+    
     def test_delete_custom_route(self):
         """Test deleting a custom routing rule"""
         # Add a route first
-        route_data = {
-            "id": "delete_test_route",
-            "vpn_instance": "test_instance",
-            "destination": "192.168.100.0/24"
-        }
-        
-        self.send_rpc_request("add-custom-route", route_data)
+        self.add_custom_routes([_DELETE_TEST_ROUTE])
         
         # Delete the route
         response = self.send_rpc_request("delete-custom-route", {
-            "id": "delete_test_route"
+            "id": _DELETE_TEST_ROUTE["id"]
         })
         
-        self.assert_success(response)
-        
-        result = response['result']
-        assert result['success'] == True
+        result = self.assert_ok(response)
         assert "deleted successfully" in result['message']
         
-        print(f"✓ Custom route deleted: {result['message']}")
+        self.log(f"✓ Custom route deleted: {result['message']}")
         
     def test_delete_nonexistent_custom_route(self):
         """Test deleting a non-existent custom route"""
@@ -43,110 +56,74 @@ class TestDeleteCustomRouteOperation(BaseRPCTest):
             "id": "nonexistent_route"
         })
         
-        self.assert_success(response, expected_success=False)
+        result = self.assert_ok(response, expected=False)
         
-        result = response['result']
-        assert result['success'] == False
-        
-        print(f"✓ Non-existent route deletion correctly rejected: {result['error']}")
+        self.log(f"✓ Non-existent route deletion correctly rejected: {result['error']}")
         
     def test_delete_missing_id(self):
         """Test deleting custom route without id"""
-        response = self.send_rpc_request("delete-custom-route", {})
-        
-        self.assert_success(response, expected_success=False)
+        response = self.send_encoded(_DELETE_MISSING_ID_REQUEST)
         
-        result = response['result']
-        assert result['success'] == False
-        assert "Missing 'id' field" in result['error']
+        result = self.assert_ok(response, expected=False)
+        assert result['code'] == ErrorCode.MISSING_PARAM
+        assert result['error'].startswith(MISSING_ID)
         
-        print(f"✓ Missing id correctly rejected: {result['error']}")
+        self.log(f"✓ Missing id correctly rejected: {result['error']}")
         
     def test_delete_empty_id(self):
         """Test deleting custom route with empty id"""
-        response = self.send_rpc_request("delete-custom-route", {
-            "id": ""
-        })
+        response = self.send_encoded(_DELETE_EMPTY_ID_REQUEST)
         
-        self.assert_success(response, expected_success=False)
+        result = self.assert_ok(response, expected=False)
+        assert result['code'] == ErrorCode.MISSING_PARAM
+        assert result['error'].startswith(MISSING_ID)
         
-        result = response['result']
-        assert result['success'] == False
-        assert "Missing 'id' field" in result['error']
-        
-        print(f"✓ Empty id correctly rejected: {result['error']}")
+        self.log(f"✓ Empty id correctly rejected: {result['error']}")
         
     def test_delete_multiple_routes(self):
         """Test deleting multiple custom routes"""
         # Add multiple routes
-        routes = [
-            {"id": "multi_delete_1", "vpn_instance": "test_instance", "destination": "192.168.1.0/24"},
-            {"id": "multi_delete_2", "vpn_instance": "test_instance", "destination": "192.168.2.0/24"},
-            {"id": "multi_delete_3", "vpn_instance": "test_instance", "destination": "192.168.3.0/24"}
-        ]
-        
-        for route in routes:
-            self.send_rpc_request("add-custom-route", route)
-            
-        # Delete all routes
-        deleted_count = 0
-        for route in routes:
-            response = self.send_rpc_request("delete-custom-route", {
-                "id": route["id"]
-            })
+        routes = _MULTI_DELETE_ROUTES
+        self.add_custom_routes(routes)
             
-            if response['result']['success']:
-                deleted_count += 1
+        # Delete all routes concurrently
+        responses = self.send_rpc_requests([("delete-custom-route", {"id": route["id"]}) for route in routes])
+        deleted_count = sum(1 for response in responses if response['result']['success'])
                 
         assert deleted_count == len(routes), f"Expected {len(routes)} deletions, got {deleted_count}"
         
-        print(f"✓ Successfully deleted {deleted_count} custom routes")
+        self.log(f"✓ Successfully deleted {deleted_count} custom routes")
         
     def test_delete_already_deleted_route(self):
         """Test deleting a route that was already deleted"""
-        route_data = {
-            "id": "already_deleted_route",
-            "vpn_instance": "test_instance",
-            "destination": "192.168.200.0/24"
-        }
+        route_id = _ALREADY_DELETED_ROUTE["id"]
         
         # Add and delete route
-        self.send_rpc_request("add-custom-route", route_data)
+        self.add_custom_routes([_ALREADY_DELETED_ROUTE])
         
         delete_response1 = self.send_rpc_request("delete-custom-route", {
-            "id": "already_deleted_route"
+            "id": route_id
         })
-        assert delete_response1['result']['success']
+        self.assert_ok(delete_response1)
         
         # Try to delete again
         response = self.send_rpc_request("delete-custom-route", {
-            "id": "already_deleted_route"
+            "id": route_id
         })
         
         # Should fail
-        self.assert_success(response, expected_success=False)
+        result = self.assert_ok(response, expected=False)
         
-        print(f"✓ Already deleted route correctly rejected: {response['result']['error']}")
+        self.log(f"✓ Already deleted route correctly rejected: {result['error']}")
 
 def main():
     """Run delete-custom-route operation tests"""
     test = TestDeleteCustomRouteOperation()
     
-    tests = [
-        test.test_delete_custom_route,
-        test.test_delete_nonexistent_custom_route,
-        test.test_delete_missing_id,
-        test.test_delete_empty_id,
-        test.test_delete_multiple_routes,
-        test.test_delete_already_deleted_route
-    ]
+    tests = test.discover_tests()
     
-    passed = 0
+    passed = sum(test.run_tests(tests))
     total = len(tests)
-    
-    for test_func in tests:
-        if test.run_test(test_func):
-            passed += 1
             
     print(f"\n📊 Delete Custom Route Operation Tests Results: {passed}/{total} passed")
     return passed == total
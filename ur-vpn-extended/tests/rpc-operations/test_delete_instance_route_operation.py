@@ -5,168 +5,109 @@ Delete a route rule from a specific instance
 """
 
 import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from base_rpc_test import BaseRPCTest
+from base_rpc_test import BaseRPCTest, encode_request, DEFAULT_OVPN_CLIENT_CONFIG, ErrorCode, MISSING_INSTANCE_NAME, MISSING_RULE_ID, RULE_NOT_FOUND
+
+# Fixed negative-test requests, encoded once at import
+_DELETE_MISSING_INSTANCE_NAME_REQUEST = encode_request("delete-instance-route", {
+    "rule_id": "test_route"
+})
+_DELETE_MISSING_RULE_ID_REQUEST = encode_request("delete-instance-route", {
+    "instance_name": "test_instance"
+})
 
 class TestDeleteInstanceRouteOperation(BaseRPCTest):
     """Test delete-instance-route operation"""
     
+    __slots__ = ()
+    
     def test_delete_instance_route(self):
         """Test deleting a route from a specific instance"""
+        instance_name = self.unique_name("delete_route_instance")
+        
         # Add an instance and route
-        config_content = """
-client
-dev tun
-proto udp
-remote 127.0.0.1 1194
-        """.strip()
-        
-        self.send_rpc_request("add", {
-            "instance_name": "delete_route_instance",
-            "config_content": config_content,
-            "vpn_type": "openvpn",
-            "auto_start": False
-        })
+        self.ensure_instance(instance_name, DEFAULT_OVPN_CLIENT_CONFIG)
         
         route_rule = {
             "id": "delete_route_test",
             "destination": "192.168.2.0/24"
         }
         
-        self.send_rpc_request("add-instance-route", {
-            "instance_name": "delete_route_instance",
-            "route_rule": route_rule
-        })
+        self.send_add_instance_route(instance_name, route_rule)
         
         # Delete the route
-        response = self.send_rpc_request("delete-instance-route", {
-            "instance_name": "delete_route_instance",
-            "rule_id": "delete_route_test"
-        })
+        response = self.send_delete_instance_route(instance_name, "delete_route_test")
         
-        self.assert_success(response)
+        result = self.assert_ok(response)
         
-        result = response['result']
-        assert result['success'] == True
-        
-        print(f"✓ Instance route deleted successfully")
+        self.log(f"✓ Instance route deleted successfully")
         
     def test_delete_missing_instance_name(self):
         """Test deleting route without instance_name"""
-        response = self.send_rpc_request("delete-instance-route", {
-            "rule_id": "test_route"
-        })
-        
-        self.assert_success(response, expected_success=False)
+        response = self.send_encoded(_DELETE_MISSING_INSTANCE_NAME_REQUEST)
         
-        result = response['result']
-        assert result['success'] == False
-        assert "Missing 'instance_name'" in result['error']
+        result = self.assert_ok(response, expected=False)
+        assert result['code'] == ErrorCode.MISSING_PARAM
+        assert result['error'].startswith(MISSING_INSTANCE_NAME)
         
-        print(f"✓ Missing instance_name correctly rejected: {result['error']}")
+        self.log(f"✓ Missing instance_name correctly rejected: {result['error']}")
         
     def test_delete_missing_rule_id(self):
         """Test deleting route without rule_id"""
-        response = self.send_rpc_request("delete-instance-route", {
-            "instance_name": "test_instance"
-        })
-        
-        self.assert_success(response, expected_success=False)
+        response = self.send_encoded(_DELETE_MISSING_RULE_ID_REQUEST)
         
-        result = response['result']
-        assert result['success'] == False
-        assert "Missing 'rule_id'" in result['error']
+        result = self.assert_ok(response, expected=False)
+        assert result['code'] == ErrorCode.MISSING_PARAM
+        assert result['error'].startswith(MISSING_RULE_ID)
         
-        print(f"✓ Missing rule_id correctly rejected: {result['error']}")
+        self.log(f"✓ Missing rule_id correctly rejected: {result['error']}")
         
     def test_delete_nonexistent_instance_route(self):
         """Test deleting non-existent route from instance"""
-        response = self.send_rpc_request("delete-instance-route", {
-            "instance_name": "test_instance",
-            "rule_id": "nonexistent_route"
-        })
+        response = self.send_delete_instance_route("test_instance", "nonexistent_route")
         
-        self.assert_success(response, expected_success=False)
+        result = self.assert_ok(response, expected=False)
+        assert result['error'].startswith(RULE_NOT_FOUND)
         
-        result = response['result']
-        assert result['success'] == False
-        assert "Rule not found" in result['error']
-        
-        print(f"✓ Non-existent route deletion correctly rejected: {result['error']}")
+        self.log(f"✓ Non-existent route deletion correctly rejected: {result['error']}")
         
     def test_delete_route_from_nonexistent_instance(self):
         """Test deleting route from non-existent instance"""
-        response = self.send_rpc_request("delete-instance-route", {
-            "instance_name": "nonexistent_instance",
-            "rule_id": "test_route"
-        })
-        
-        self.assert_success(response, expected_success=False)
+        response = self.send_delete_instance_route("nonexistent_instance", "test_route")
         
-        result = response['result']
-        assert result['success'] == False
+        result = self.assert_ok(response, expected=False)
         
-        print(f"✓ Route from non-existent instance correctly rejected: {result['error']}")
+        self.log(f"✓ Route from non-existent instance correctly rejected: {result['error']}")
         
     def test_delete_multiple_routes_from_instance(self):
         """Test deleting multiple routes from instance"""
+        instance_name = self.unique_name("multi_delete_instance")
+        
         # Add instance
-        config_content = "client\ndev tun\nproto udp\nremote 127.0.0.1 1194"
-        
-        self.send_rpc_request("add", {
-            "instance_name": "multi_delete_instance",
-            "config_content": config_content,
-            "vpn_type": "openvpn",
-            "auto_start": False
-        })
-        
-        # Add multiple routes
-        routes = [
-            {"id": "multi_delete_1", "destination": "192.168.1.0/24"},
-            {"id": "multi_delete_2", "destination": "192.168.2.0/24"},
-            {"id": "multi_delete_3", "destination": "192.168.3.0/24"}
-        ]
-        
-        for route in routes:
-            self.send_rpc_request("add-instance-route", {
-                "instance_name": "multi_delete_instance",
-                "route_rule": route
-            })
+        self.ensure_instance(instance_name, DEFAULT_OVPN_CLIENT_CONFIG)
+        
+        # Add multiple routes; per-instance route changes are not synchronized
+        # server-side, so they go out one at a time rather than concurrently
+        route_ids = [f"multi_delete_{i}" for i in range(1, 4)]
+        add_route = self.send_add_instance_route
+        for i, rule_id in enumerate(route_ids, 1):
+            add_route(instance_name, {"id": rule_id, "destination": f"192.168.{i}.0/24"})
         
         # Delete all routes
-        deleted_count = 0
-        for route in routes:
-            response = self.send_rpc_request("delete-instance-route", {
-                "instance_name": "multi_delete_instance",
-                "rule_id": route["id"]
-            })
-            
-            if response['result']['success']:
-                deleted_count += 1
+        delete_route = self.send_delete_instance_route
+        deleted_count = sum(1 for rule_id in route_ids
+                            if delete_route(instance_name, rule_id)['result']['success'])
                 
-        print(f"✓ Deleted {deleted_count}/{len(routes)} routes from instance")
+        self.log(f"✓ Deleted {deleted_count}/{len(route_ids)} routes from instance")
 
 def main():
     """Run delete-instance-route operation tests"""
     test = TestDeleteInstanceRouteOperation()
     
-    tests = [
-        test.test_delete_instance_route,
-        test.test_delete_missing_instance_name,
-        test.test_delete_missing_rule_id,
-        test.test_delete_nonexistent_instance_route,
-        test.test_delete_route_from_nonexistent_instance,
-        test.test_delete_multiple_routes_from_instance
-    ]
+    tests = test.discover_tests()
     
-    passed = 0
+    passed = sum(test.run_tests(tests))
     total = len(tests)
-    
-    for test_func in tests:
-        if test.run_test(test_func):
-            passed += 1
             
     print(f"\n📊 Delete Instance Route Operation Tests Results: {passed}/{total} passed")
     return passed == total
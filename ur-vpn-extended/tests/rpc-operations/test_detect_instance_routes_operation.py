@@ -5,129 +5,97 @@ Detect routes for a specific instance
 """
 
 import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from base_rpc_test import BaseRPCTest
+from base_rpc_test import BaseRPCTest, encode_request, DEFAULT_OVPN_CLIENT_CONFIG, ErrorCode, MISSING_INSTANCE_NAME
+
+OVPN_TWO_ROUTES_CONFIG = (DEFAULT_OVPN_CLIENT_CONFIG +
+                          "\nroute 192.168.1.0 255.255.255.0"
+                          "\nroute 10.0.0.0 255.0.0.0")
+OVPN_ONE_ROUTE_CONFIG = DEFAULT_OVPN_CLIENT_CONFIG + "\nroute 192.168.1.0 255.255.255.0"
+WIREGUARD_CLIENT_CONFIG = """[Interface]
+PrivateKey = abc123def456...
+Address = 10.0.0.2/24
+
+[Peer]
+PublicKey = xyz789uvw012...
+Endpoint = 10.0.0.1:51820
+AllowedIPs = 0.0.0.0/0"""
+
+# Fixed negative-test requests, encoded once at import
+_DETECT_MISSING_INSTANCE_NAME_REQUEST = encode_request("detect-instance-routes", {})
 
 class TestDetectInstanceRoutesOperation(BaseRPCTest):
     """Test detect-instance-routes operation"""
     
+    __slots__ = ()
+    
     def test_detect_instance_routes(self):
         """Test detecting routes for a specific instance"""
+        instance_name = self.unique_name("detect_routes_instance")
+        
         # Add an instance
-        config_content = """
-client
-dev tun
-proto udp
-remote 127.0.0.1 1194
-route 192.168.1.0 255.255.255.0
-route 10.0.0.0 255.0.0.0
-        """.strip()
-        
-        self.send_rpc_request("add", {
-            "instance_name": "detect_routes_instance",
-            "config_content": config_content,
-            "vpn_type": "openvpn",
-            "auto_start": False
-        })
+        self.ensure_instance(instance_name, OVPN_TWO_ROUTES_CONFIG)
         
         # Detect routes
-        response = self.send_rpc_request("detect-instance-routes", {
-            "instance_name": "detect_routes_instance"
-        })
+        response = self.send_detect_instance_routes(instance_name)
         
-        self.assert_success(response)
-        self.assert_contains_fields(response, "success", "detected_routes")
-        
-        result = response['result']
-        assert result['success'] == True
-        assert "detected_routes" in result
+        result = self.assert_ok(response, "detected_routes")
         
         detected_routes = result['detected_routes']
-        assert isinstance(detected_routes, int), "Detected routes should be an integer"
-        assert detected_routes >= 0, "Detected routes should be non-negative"
+        assert type(detected_routes) is int and detected_routes >= 0, "Detected routes should be a non-negative integer"
         
-        print(f"✓ Detected {detected_routes} routes for instance")
+        self.log(f"✓ Detected {detected_routes} routes for instance")
         
     def test_detect_missing_instance_name(self):
         """Test detecting routes without instance_name"""
-        response = self.send_rpc_request("detect-instance-routes", {})
-        
-        self.assert_success(response, expected_success=False)
+        response = self.send_encoded(_DETECT_MISSING_INSTANCE_NAME_REQUEST)
         
-        result = response['result']
-        assert result['success'] == False
-        assert "Missing 'instance_name'" in result['error']
+        result = self.assert_ok(response, expected=False)
+        assert result['code'] == ErrorCode.MISSING_PARAM
+        assert result['error'].startswith(MISSING_INSTANCE_NAME)
         
-        print(f"✓ Missing instance_name correctly rejected: {result['error']}")
+        self.log(f"✓ Missing instance_name correctly rejected: {result['error']}")
         
     def test_detect_empty_instance_name(self):
         """Test detecting routes with empty instance_name"""
-        response = self.send_rpc_request("detect-instance-routes", {
-            "instance_name": ""
-        })
+        response = self.send_detect_instance_routes("")
         
-        self.assert_success(response, expected_success=False)
+        result = self.assert_ok(response, expected=False)
+        assert result['code'] == ErrorCode.MISSING_PARAM
+        assert result['error'].startswith(MISSING_INSTANCE_NAME)
         
-        result = response['result']
-        assert result['success'] == False
-        assert "Missing 'instance_name'" in result['error']
-        
-        print(f"✓ Empty instance_name correctly rejected: {result['error']}")
+        self.log(f"✓ Empty instance_name correctly rejected: {result['error']}")
         
     def test_detect_nonexistent_instance_routes(self):
         """Test detecting routes for non-existent instance"""
-        response = self.send_rpc_request("detect-instance-routes", {
-            "instance_name": "nonexistent_instance"
-        })
-        
-        self.assert_success(response, expected_success=False)
+        response = self.send_detect_instance_routes("nonexistent_instance")
         
-        result = response['result']
-        assert result['success'] == False
+        result = self.assert_ok(response, expected=False)
         
-        print(f"✓ Non-existent instance routes detect correctly rejected: {result['error']}")
+        self.log(f"✓ Non-existent instance routes detect correctly rejected: {result['error']}")
         
     def test_detect_routes_simple_config(self):
         """Test detecting routes for instance with simple config"""
+        instance_name = self.unique_name("detect_simple_instance")
+        
         # Add instance with simple config (no routes)
-        config_content = """
-client
-dev tun
-proto udp
-remote 127.0.0.1 1194
-        """.strip()
-        
-        self.send_rpc_request("add", {
-            "instance_name": "detect_simple_instance",
-            "config_content": config_content,
-            "vpn_type": "openvpn",
-            "auto_start": False
-        })
+        self.ensure_instance(instance_name, DEFAULT_OVPN_CLIENT_CONFIG)
         
         # Detect routes
-        response = self.send_rpc_request("detect-instance-routes", {
-            "instance_name": "detect_simple_instance"
-        })
-        
-        self.assert_success(response)
+        response = self.send_detect_instance_routes(instance_name)
         
-        result = response['result']
+        result = self.assert_ok(response)
         detected_routes = result['detected_routes']
-        assert isinstance(detected_routes, int), "Detected routes should be an integer"
+        assert type(detected_routes) is int and detected_routes >= 0, "Detected routes should be a non-negative integer"
         
-        print(f"✓ Detected {detected_routes} routes for simple config")
+        self.log(f"✓ Detected {detected_routes} routes for simple config")
         
     def test_detect_routes_complex_config(self):
         """Test detecting routes for instance with complex config"""
+        instance_name = self.unique_name("detect_complex_instance")
+        
         # Add instance with many routes
-        config_lines = [
-            "client",
-            "dev tun",
-            "proto udp",
-            "remote 127.0.0.1 1194"
-        ]
+        config_lines = [DEFAULT_OVPN_CLIENT_CONFIG]
         
         # Add many route lines
         for i in range(10):
@@ -135,120 +103,63 @@ remote 127.0.0.1 1194
         
         config_content = "\n".join(config_lines)
         
-        self.send_rpc_request("add", {
-            "instance_name": "detect_complex_instance",
-            "config_content": config_content,
-            "vpn_type": "openvpn",
-            "auto_start": False
-        })
+        self.ensure_instance(instance_name, config_content)
         
         # Detect routes
-        response = self.send_rpc_request("detect-instance-routes", {
-            "instance_name": "detect_complex_instance"
-        })
-        
-        self.assert_success(response)
+        response = self.send_detect_instance_routes(instance_name)
         
-        result = response['result']
+        result = self.assert_ok(response)
         detected_routes = result['detected_routes']
-        assert isinstance(detected_routes, int), "Detected routes should be an integer"
+        assert type(detected_routes) is int, "Detected routes should be an integer"
         assert detected_routes >= 10, "Should detect at least 10 routes"
         
-        print(f"✓ Detected {detected_routes} routes for complex config")
+        self.log(f"✓ Detected {detected_routes} routes for complex config")
         
     def test_detect_routes_wireguard_config(self):
         """Test detecting routes for WireGuard instance"""
-        # Add WireGuard instance
-        config_content = """
-[Interface]
-PrivateKey = abc123def456...
-Address = 10.0.0.2/24
-
-[Peer]
-PublicKey = xyz789uvw012...
-Endpoint = 10.0.0.1:51820
-AllowedIPs = 0.0.0.0/0
-        """.strip()
+        instance_name = self.unique_name("detect_wg_instance")
         
-        self.send_rpc_request("add", {
-            "instance_name": "detect_wg_instance",
-            "config_content": config_content,
-            "vpn_type": "wireguard",
-            "auto_start": False
-        })
+        # Add WireGuard instance
+        self.ensure_instance(instance_name, WIREGUARD_CLIENT_CONFIG, vpn_type="wireguard")
         
         # Detect routes
-        response = self.send_rpc_request("detect-instance-routes", {
-            "instance_name": "detect_wg_instance"
-        })
+        response = self.send_detect_instance_routes(instance_name)
         
-        self.assert_success(response)
-        
-        result = response['result']
+        result = self.assert_ok(response)
         detected_routes = result['detected_routes']
-        assert isinstance(detected_routes, int), "Detected routes should be an integer"
+        assert type(detected_routes) is int and detected_routes >= 0, "Detected routes should be a non-negative integer"
         
-        print(f"✓ Detected {detected_routes} routes for WireGuard instance")
+        self.log(f"✓ Detected {detected_routes} routes for WireGuard instance")
         
     def test_detect_routes_consistency(self):
         """Test that detect-instance-routes returns consistent results"""
+        instance_name = self.unique_name("detect_consistency_instance")
+        
         # Add instance
-        config_content = """
-client
-dev tun
-proto udp
-remote 127.0.0.1 1194
-route 192.168.1.0 255.255.255.0
-        """.strip()
-        
-        self.send_rpc_request("add", {
-            "instance_name": "detect_consistency_instance",
-            "config_content": config_content,
-            "vpn_type": "openvpn",
-            "auto_start": False
-        })
-        
-        # Detect routes twice
-        response1 = self.send_rpc_request("detect-instance-routes", {
-            "instance_name": "detect_consistency_instance"
-        })
-        
-        response2 = self.send_rpc_request("detect-instance-routes", {
-            "instance_name": "detect_consistency_instance"
-        })
+        self.ensure_instance(instance_name, OVPN_ONE_ROUTE_CONFIG)
         
-        # Both should succeed and return same count
-        assert response1['result']['success']
-        assert response2['result']['success']
+        # Detect routes twice; the second call bypasses the read-only response cache
+        response1 = self.send_detect_instance_routes(instance_name)
+        
+        response2 = self.send_rpc_request("detect-instance-routes", {"instance_name": instance_name},
+                                          use_cache=False)
         
-        routes1 = response1['result']['detected_routes']
-        routes2 = response2['result']['detected_routes']
+        # Both should succeed and return same count
+        routes1 = self.assert_ok(response1, "detected_routes")['detected_routes']
+        routes2 = self.assert_ok(response2, "detected_routes")['detected_routes']
         
         assert routes1 == routes2, "Route detection should be consistent"
         
-        print(f"✓ Route detection consistency verified: {routes1} routes")
+        self.log(f"✓ Route detection consistency verified: {routes1} routes")
 
 def main():
     """Run detect-instance-routes operation tests"""
     test = TestDetectInstanceRoutesOperation()
     
-    tests = [
-        test.test_detect_instance_routes,
-        test.test_detect_missing_instance_name,
-        test.test_detect_empty_instance_name,
-        test.test_detect_nonexistent_instance_routes,
-        test.test_detect_routes_simple_config,
-        test.test_detect_routes_complex_config,
-        test.test_detect_routes_wireguard_config,
-        test.test_detect_routes_consistency
-    ]
+    tests = test.discover_tests()
     
-    passed = 0
+    passed = sum(test.run_tests(tests))
     total = len(tests)
-    
-    for test_func in tests:
-        if test.run_test(test_func):
-            passed += 1
             
     print(f"\n📊 Detect Instance Routes Operation Tests Results: {passed}/{total} passed")
     return passed == total
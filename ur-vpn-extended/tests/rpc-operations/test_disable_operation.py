@@ -2,29 +2,22 @@
 """
 Test RPC operation: disable
 Disable and stop a VPN instance
-Usage: python test_disable_operation.py <instance_name>
+Usage: python test_disable_operation.py [instance_name]
 """
 
 import sys
-import os
-import json
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from base_rpc_test import BaseRPCTest
-
-def print_response(response):
-    """Pretty print the RPC response"""
-    print(f"Response:\n{json.dumps(response, indent=2)}")
+from base_rpc_test import (BaseRPCTest, shared_client, encode_request, DEFAULT_OVPN_CLIENT_CONFIG,
+                           ErrorCode, MISSING_INSTANCE_NAME, print_response)
 
 def test_disable(instance_name):
     """Test disabling a VPN instance via RPC"""
-    test = BaseRPCTest()
-    
+    test = shared_client()
+    if test is None:
+        print("✗ Test setup failed")
+        return False
+        
     try:
-        if not test.setup():
-            print("✗ Test setup failed")
-            return False
-            
         print(f"Testing: Disable VPN Instance '{instance_name}'")
         
         params = {
@@ -45,111 +38,90 @@ def test_disable(instance_name):
     except Exception as e:
         print(f"✗ Test failed: {e}")
         return False
-    finally:
-        test.teardown()
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python test_disable_operation.py <instance_name>")
-        sys.exit(1)
+# Fixed negative-test requests, encoded once at import
+_DISABLE_MISSING_INSTANCE_NAME_REQUEST = encode_request("disable", {})
+
+class TestDisableOperation(BaseRPCTest):
+    """Test disable operation"""
     
-    instance_name = sys.argv[1]
+    __slots__ = ()
     
-    success = test_disable(instance_name)
-    sys.exit(0 if success else 1)
+    def test_disable_enabled_instance(self):
+        """Test disabling a running instance"""
+        instance_name = self.unique_name("disable_enabled_instance")
+        
+        # Add and start an instance
+        self.ensure_instance(instance_name, DEFAULT_OVPN_CLIENT_CONFIG, auto_start=True)
+        
+        # Disable it
+        response = self.send_disable(instance_name)
+        
+        result = self.assert_ok(response, "message")
+        
+        self.log(f"✓ Instance disabled: {result['message']}")
+        
+    def test_disable_nonexistent_instance(self):
+        """Test disabling a non-existent instance"""
+        response = self.send_disable("nonexistent_instance")
+        
+        result = self.assert_ok(response, expected=False)
+        
+        self.log(f"✓ Non-existent instance disable correctly rejected: {result['message']}")
         
     def test_disable_missing_instance_name(self):
         """Test disabling without instance_name parameter"""
-        response = self.send_rpc_request("disable", {})
-        
-        self.assert_success(response, expected_success=False)
+        response = self.send_encoded(_DISABLE_MISSING_INSTANCE_NAME_REQUEST)
         
-        result = response['result']
-        assert result['success'] == False
-        assert "Missing 'instance_name'" in result['error']
+        result = self.assert_ok(response, expected=False)
+        assert result['code'] == ErrorCode.MISSING_PARAM
+        assert result['error'].startswith(MISSING_INSTANCE_NAME)
         
-        print(f"✓ Missing instance_name for disable correctly rejected: {result['error']}")
+        self.log(f"✓ Missing instance_name for disable correctly rejected: {result['error']}")
         
     def test_disable_already_disabled_instance(self):
         """Test disabling an already disabled instance"""
-        config_content = """
-client
-dev tun
-proto udp
-remote 127.0.0.1 1194
-        """.strip()
+        instance_name = self.unique_name("already_disabled")
         
         # Add instance without auto-start
-        self.send_rpc_request("add", {
-            "instance_name": "already_disabled",
-            "config_content": config_content,
-            "vpn_type": "openvpn",
-            "auto_start": False
-        })
+        self.ensure_instance(instance_name, DEFAULT_OVPN_CLIENT_CONFIG)
         
         # Try to disable
-        response = self.send_rpc_request("disable", {
-            "instance_name": "already_disabled"
-        })
+        response = self.send_disable(instance_name)
         
         # Should either succeed or fail gracefully
         result = response['result']
-        print(f"Disable already disabled result: {result}")
+        self.log(f"Disable already disabled result: {result}")
         
     def test_disable_multiple_instances(self):
         """Test disabling multiple instances"""
-        config_content = """
-client
-dev tun
-proto udp
-remote 127.0.0.1 1194
-        """.strip()
-        
         # Add and start multiple instances
-        instances = ["multi_disable_1", "multi_disable_2", "multi_disable_3"]
-        
-        for instance in instances:
-            self.send_rpc_request("add", {
-                "instance_name": instance,
-                "config_content": config_content,
-                "vpn_type": "openvpn",
-                "auto_start": True
-            })
-            
-        # Disable all instances
-        disabled_count = 0
-        for instance in instances:
-            response = self.send_rpc_request("disable", {
-                "instance_name": instance
-            })
-            
-            if response['result']['success']:
-                disabled_count += 1
+        instances = [self.unique_name("multi_disable") for _ in range(3)]
+        
+        self.ensure_instances(instances, DEFAULT_OVPN_CLIENT_CONFIG, auto_start=True)
+        
+        # Disable all instances concurrently
+        responses = self.send_rpc_requests([("disable", {"instance_name": instance}) for instance in instances])
+        disabled_count = sum(1 for response in responses if response['result']['success'])
                 
-        print(f"✓ Disabled {disabled_count}/{len(instances)} instances")
+        self.log(f"✓ Disabled {disabled_count}/{len(instances)} instances")
 
 def main():
     """Run disable operation tests"""
     test = TestDisableOperation()
     
-    tests = [
-        test.test_disable_enabled_instance,
-        test.test_disable_nonexistent_instance,
-        test.test_disable_missing_instance_name,
-        test.test_disable_already_disabled_instance,
-        test.test_disable_multiple_instances
-    ]
+    tests = test.discover_tests()
     
-    passed = 0
+    passed = sum(test.run_tests(tests))
     total = len(tests)
-    
-    for test_func in tests:
-        if test.run_test(test_func):
-            passed += 1
             
     print(f"\n📊 Disable Operation Tests Results: {passed}/{total} passed")
     return passed == total
 
 if __name__ == "__main__":
-    success = main()
+    # With an instance name, disable that instance; otherwise run the test suite
+    if len(sys.argv) > 1:
+        success = test_disable(sys.argv[1])
+    else:
+        success = main()
     sys.exit(0 if success else 1)
@@ -4,48 +4,68 @@ Test RPC operation: get-instance-routes
 Get routing rules for a specific instance
 """
 
-import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import sys
+import threading
+
+from base_rpc_test import BaseRPCTest, encode_request, DEFAULT_OVPN_CLIENT_CONFIG, ErrorCode, MISSING_INSTANCE_NAME
+
+# Fixed negative-test requests, encoded once at import
+_GET_MISSING_INSTANCE_NAME_REQUEST = encode_request("get-instance-routes", {})
+_GET_EMPTY_INSTANCE_NAME_REQUEST = encode_request("get-instance-routes", {"instance_name": ""})
 
-from base_rpc_test import BaseRPCTest
+# One instance with a canonical route, provisioned once per process for the read-only tests
+_SHARED_READ_INSTANCE = f"shared_read_instance_{os.getpid()}"
+_CANONICAL_ROUTE = {
+    "id": "structure_route",
+    "destination": "172.16.0.0/16",
+    "type": "tunnel_all",
+    "priority": 100,
+    "enabled": True
+}
+_shared_read_lock = threading.Lock()
+# Client that provisioned the shared instance. Its teardown() deletes the instance,
+# so the instance exists exactly while that delete is still in the client's queue
+_SHARED_READ_CLEANUP = ("delete", {"instance_name": _SHARED_READ_INSTANCE})
+_shared_read_owner = None
 
 class TestGetInstanceRoutesOperation(BaseRPCTest):
     """Test get-instance-routes operation"""
     
+    __slots__ = ()
+    
+    def shared_read_instance(self) -> str:
+        """Name of the shared read-only instance, adding it and its canonical route when missing"""
+        global _shared_read_owner
+        with _shared_read_lock:
+            owner = _shared_read_owner
+            if owner is None or _SHARED_READ_CLEANUP not in owner.cleanup_requests:
+                self.assert_ok(self.ensure_instance(_SHARED_READ_INSTANCE, DEFAULT_OVPN_CLIENT_CONFIG))
+                try:
+                    self.assert_ok(self.send_add_instance_route(_SHARED_READ_INSTANCE, _CANONICAL_ROUTE))
+                except Exception:
+                    # Start over on the next use rather than share an instance without its route
+                    self.send_delete(_SHARED_READ_INSTANCE)
+                    raise
+                self.add_cleanup(*_SHARED_READ_CLEANUP)
+                _shared_read_owner = self
+        return _SHARED_READ_INSTANCE
+        
     def test_get_instance_routes(self):
         """Test getting routes for a specific instance"""
-        # Add an instance first
-        config_content = """
-client
-dev tun
-proto udp
-remote 127.0.0.1 1194
-        """.strip()
-        
-        self.send_rpc_request("add", {
-            "instance_name": "route_test_instance",
-            "config_content": config_content,
-            "vpn_type": "openvpn",
-            "auto_start": False
-        })
+        instance_name = self.shared_read_instance()
         
         # Get instance routes
         response = self.send_rpc_request("get-instance-routes", {
-            "instance_name": "route_test_instance"
+            "instance_name": instance_name
         })
         
-        self.assert_success(response)
-        self.assert_contains_fields(response, "success", "routing_rules")
-        
-        result = response['result']
-        assert result['success'] == True
-        assert "routing_rules" in result
+        result = self.assert_ok(response, "routing_rules")
         
         routing_rules = result['routing_rules']
         assert isinstance(routing_rules, list), "Routing rules should be a list"
         
-        print(f"✓ Retrieved instance routes: {len(routing_rules)} routes found")
+        self.log(f"✓ Retrieved instance routes: {len(routing_rules)} routes found")
         
     def test_get_nonexistent_instance_routes(self):
         """Test getting routes for non-existent instance"""
@@ -53,56 +73,36 @@ remote 127.0.0.1 1194
             "instance_name": "nonexistent_instance"
         })
         
-        self.assert_success(response, expected_success=False)
-        
-        result = response['result']
-        assert result['success'] == False
-        assert "error" in result
+        result = self.assert_ok(response, "error", expected=False)
         
-        print(f"✓ Non-existent instance routes correctly rejected: {result['error']}")
+        self.log(f"✓ Non-existent instance routes correctly rejected: {result['error']}")
         
     def test_get_missing_instance_name(self):
         """Test getting routes without instance_name"""
-        response = self.send_rpc_request("get-instance-routes", {})
-        
-        self.assert_success(response, expected_success=False)
+        response = self.send_encoded(_GET_MISSING_INSTANCE_NAME_REQUEST)
         
-        result = response['result']
-        assert result['success'] == False
-        assert "Missing 'instance_name'" in result['error']
+        result = self.assert_ok(response, expected=False)
+        assert result['code'] == ErrorCode.MISSING_PARAM
+        assert result['error'].startswith(MISSING_INSTANCE_NAME)
         
-        print(f"✓ Missing instance_name correctly rejected: {result['error']}")
+        self.log(f"✓ Missing instance_name correctly rejected: {result['error']}")
         
     def test_get_empty_instance_name(self):
         """Test getting routes with empty instance_name"""
-        response = self.send_rpc_request("get-instance-routes", {
-            "instance_name": ""
-        })
-        
-        self.assert_success(response, expected_success=False)
+        response = self.send_encoded(_GET_EMPTY_INSTANCE_NAME_REQUEST)
         
-        result = response['result']
-        assert result['success'] == False
-        assert "Missing 'instance_name'" in result['error']
+        result = self.assert_ok(response, expected=False)
+        assert result['code'] == ErrorCode.MISSING_PARAM
+        assert result['error'].startswith(MISSING_INSTANCE_NAME)
         
-        print(f"✓ Empty instance_name correctly rejected: {result['error']}")
+        self.log(f"✓ Empty instance_name correctly rejected: {result['error']}")
         
     def test_get_instance_routes_with_added_routes(self):
         """Test getting routes for instance with added routes"""
+        instance_name = self.unique_name("routes_with_added")
+        
         # Add an instance
-        config_content = """
-client
-dev tun
-proto udp
-remote 127.0.0.1 1194
-        """.strip()
-        
-        self.send_rpc_request("add", {
-            "instance_name": "routes_with_added",
-            "config_content": config_content,
-            "vpn_type": "openvpn",
-            "auto_start": False
-        })
+        self.assert_ok(self.ensure_instance(instance_name, DEFAULT_OVPN_CLIENT_CONFIG))
         
         # Add some routes to the instance
         routes = [
@@ -110,95 +110,50 @@ remote 127.0.0.1 1194
             {"id": "instance_route_2", "destination": "10.0.0.0/8", "type": "split_tunnel"}
         ]
         
-        for route in routes:
-            self.send_rpc_request("add-instance-route", {
-                "instance_name": "routes_with_added",
-                "route_rule": route
-            })
-        
-        # Get instance routes
-        response = self.send_rpc_request("get-instance-routes", {
-            "instance_name": "routes_with_added"
-        })
-        
-        self.assert_success(response)
+        # Chain the adds and the lookup; each waits for the entry before it
+        batch = [("add-instance-route", {"instance_name": instance_name, "route_rule": route}, i - 1 if i else None)
+                 for i, route in enumerate(routes)]
+        batch.append(("get-instance-routes", {"instance_name": instance_name}, len(routes) - 1))
+        *added, response = self.send_rpc_dependent_batch(batch)
+        for reply in added:
+            self.assert_ok(reply)
         
-        result = response['result']
+        result = self.assert_ok(response)
         routing_rules = result['routing_rules']
         assert isinstance(routing_rules, list), "Routing rules should be a list"
         
-        print(f"✓ Retrieved instance routes with added routes: {len(routing_rules)} routes found")
+        self.log(f"✓ Retrieved instance routes with added routes: {len(routing_rules)} routes found")
         
     def test_get_instance_routes_structure(self):
         """Test that instance routes have proper structure"""
-        # Add instance
-        config_content = "client\ndev tun\nproto udp\nremote 127.0.0.1 1194"
-        
-        self.send_rpc_request("add", {
-            "instance_name": "structure_test_instance",
-            "config_content": config_content,
-            "vpn_type": "openvpn",
-            "auto_start": False
-        })
-        
-        # Add a route with full structure
-        full_route = {
-            "id": "structure_route",
-            "destination": "172.16.0.0/16",
-            "type": "tunnel_all",
-            "priority": 100,
-            "enabled": True
-        }
-        
-        self.send_rpc_request("add-instance-route", {
-            "instance_name": "structure_test_instance",
-            "route_rule": full_route
-        })
+        instance_name = self.shared_read_instance()
         
-        # Get routes
+        # Get just the canonical route; the server filters by id
         response = self.send_rpc_request("get-instance-routes", {
-            "instance_name": "structure_test_instance"
+            "instance_name": instance_name,
+            "id": _CANONICAL_ROUTE["id"]
         })
         
-        self.assert_success(response)
-        
-        result = response['result']
+        result = self.assert_ok(response)
         routing_rules = result['routing_rules']
+        found_route = routing_rules[0] if routing_rules else None
         
-        # Find our route
-        found_route = None
-        for route in routing_rules:
-            if route.get('id') == 'structure_route':
-                found_route = route
-                break
-                
         if found_route:
             assert isinstance(found_route, dict), "Route should be a dictionary"
             expected_fields = ['id', 'destination']
             for field in expected_fields:
                 assert field in found_route, f"Route should have {field} field"
         
-        print(f"✓ Instance routes have proper structure")
+        self.log(f"✓ Instance routes have proper structure")
 
 def main():
     """Run get-instance-routes operation tests"""
     test = TestGetInstanceRoutesOperation()
     
-    tests = [
-        test.test_get_instance_routes,
-        test.test_get_nonexistent_instance_routes,
-        test.test_get_missing_instance_name,
-        test.test_get_empty_instance_name,
-        test.test_get_instance_routes_with_added_routes,
-        test.test_get_instance_routes_structure
-    ]
+    tests = test.discover_tests()
     
-    passed = 0
+    passed = sum(test.run_tests(tests))
     total = len(tests)
-    
-    for test_func in tests:
-        if test.run_test(test_func):
-            passed += 1
             
     print(f"\n📊 Get Instance Routes Operation Tests Results: {passed}/{total} passed")
     return passed == total
@@ -4,78 +4,82 @@ Test RPC operation: list-custom-routes
 List all custom routing rules
 """
 
-import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import sys
 
 from base_rpc_test import BaseRPCTest
 
+# Route fixtures, built once at import; tests only read them. Their ids carry
+# the process id so concurrent runs never share a route on the server
+_LIST_TEST_ROUTES = [
+    {
+        "id": f"list_test_1_{os.getpid()}",
+        "vpn_instance": "test_instance",
+        "destination": "192.168.1.0/24"
+    },
+    {
+        "id": f"list_test_2_{os.getpid()}",
+        "vpn_instance": "test_instance",
+        "destination": "10.0.0.0/8"
+    },
+    {
+        "id": f"list_test_3_{os.getpid()}",
+        "vpn_instance": "test_instance",
+        "destination": "172.16.0.0/16"
+    }
+]
+_PARAM_TEST_ROUTE = {
+    "id": f"param_test_route_{os.getpid()}",
+    "vpn_instance": "test_instance",
+    "destination": "192.168.50.0/24"
+}
+_STRUCTURE_TEST_ROUTE = {
+    "id": f"structure_test_route_{os.getpid()}",
+    "name": "Structure Test",
+    "vpn_instance": "test_instance",
+    "destination": "192.168.100.0/24",
+    "priority": 100,
+    "enabled": True,
+    "description": "Test route structure"
+}
+
 class TestListCustomRoutesOperation(BaseRPCTest):
     """Test list-custom-routes operation"""
     
+    __slots__ = ()
+    
     def test_list_custom_routes_empty(self):
         """Test listing custom routes when none exist"""
         response = self.send_rpc_request("list-custom-routes", {})
         
-        self.assert_success(response)
-        self.assert_contains_fields(response, "success", "routing_rules")
-        
-        result = response['result']
-        assert result['success'] == True
-        assert "routing_rules" in result
+        result = self.assert_ok(response, "routing_rules")
         
         routing_rules = result['routing_rules']
         assert isinstance(routing_rules, list), "Routing rules should be a list"
         
-        print(f"✓ Listed custom routes (empty): {len(routing_rules)} routes found")
+        self.log(f"✓ Listed custom routes (empty): {len(routing_rules)} routes found")
         
     def test_list_custom_routes_with_data(self):
         """Test listing custom routes when some exist"""
         # Add some routes first
-        routes = [
-            {
-                "id": "list_test_1",
-                "vpn_instance": "test_instance",
-                "destination": "192.168.1.0/24"
-            },
-            {
-                "id": "list_test_2",
-                "vpn_instance": "test_instance",
-                "destination": "10.0.0.0/8"
-            },
-            {
-                "id": "list_test_3",
-                "vpn_instance": "test_instance",
-                "destination": "172.16.0.0/16"
-            }
-        ]
-        
-        for route in routes:
-            self.send_rpc_request("add-custom-route", route)
+        routes = _LIST_TEST_ROUTES
+        self.add_custom_routes(routes)
         
         # List routes
         response = self.send_rpc_request("list-custom-routes", {})
         
-        self.assert_success(response)
-        
-        result = response['result']
-        assert result['success'] == True
-        assert "routing_rules" in result
+        result = self.assert_ok(response, "routing_rules")
         
         routing_rules = result['routing_rules']
         assert isinstance(routing_rules, list), "Routing rules should be a list"
         assert len(routing_rules) >= len(routes), "Should have at least the routes we added"
         
-        print(f"✓ Listed custom routes with data: {len(routing_rules)} routes found")
+        self.log(f"✓ Listed custom routes with data: {len(routing_rules)} routes found")
         
     def test_list_custom_routes_with_parameters(self):
         """Test listing custom routes with extra parameters"""
         # Add a route first
-        self.send_rpc_request("add-custom-route", {
-            "id": "param_test_route",
-            "vpn_instance": "test_instance",
-            "destination": "192.168.50.0/24"
-        })
+        self.add_custom_routes([_PARAM_TEST_ROUTE])
         
         # List with extra parameters (should be ignored)
         response = self.send_rpc_request("list-custom-routes", {
@@ -84,47 +88,25 @@ class TestListCustomRoutesOperation(BaseRPCTest):
             "limit": 10
         })
         
-        self.assert_success(response)
-        
-        result = response['result']
-        assert result['success'] == True
-        assert "routing_rules" in result
+        result = self.assert_ok(response, "routing_rules")
         
         routing_rules = result['routing_rules']
         assert isinstance(routing_rules, list), "Routing rules should be a list"
         
-        print(f"✓ Listed custom routes with parameters: {len(routing_rules)} routes found")
+        self.log(f"✓ Listed custom routes with parameters: {len(routing_rules)} routes found")
         
     def test_list_custom_routes_structure(self):
         """Test that listed custom routes have proper structure"""
         # Add a route with all fields
-        full_route = {
-            "id": "structure_test_route",
-            "name": "Structure Test",
-            "vpn_instance": "test_instance",
-            "destination": "192.168.100.0/24",
-            "priority": 100,
-            "enabled": True,
-            "description": "Test route structure"
-        }
-        
-        self.send_rpc_request("add-custom-route", full_route)
-        
-        # List routes
-        response = self.send_rpc_request("list-custom-routes", {})
+        self.add_custom_routes([_STRUCTURE_TEST_ROUTE])
         
-        self.assert_success(response)
+        # List just our route; the server filters by id
+        response = self.send_rpc_request("list-custom-routes", {"id": _STRUCTURE_TEST_ROUTE["id"]})
         
-        result = response['result']
+        result = self.assert_ok(response)
         routing_rules = result['routing_rules']
+        found_route = routing_rules[0] if routing_rules else None
         
-        # Find our route in the list
-        found_route = None
-        for route in routing_rules:
-            if route.get('id') == 'structure_test_route':
-                found_route = route
-                break
-                
         assert found_route is not None, "Should find our test route in the list"
         assert isinstance(found_route, dict), "Route should be a dictionary"
         
@@ -133,7 +115,7 @@ class TestListCustomRoutesOperation(BaseRPCTest):
         for field in expected_fields:
             assert field in found_route, f"Route should have {field} field"
         
-        print(f"✓ Custom routes have proper structure")
+        self.log(f"✓ Custom routes have proper structure")
         
     def test_list_custom_routes_consistency(self):
         """Test that list-custom-routes returns consistent data"""
@@ -142,35 +124,23 @@ class TestListCustomRoutesOperation(BaseRPCTest):
         response2 = self.send_rpc_request("list-custom-routes", {})
         
         # Both should succeed
-        assert response1['result']['success']
-        assert response2['result']['success']
-        
-        rules1 = response1['result']['routing_rules']
-        rules2 = response2['result']['routing_rules']
+        rules1 = self.assert_ok(response1, "routing_rules")['routing_rules']
+        rules2 = self.assert_ok(response2, "routing_rules")['routing_rules']
         
         # Should return same number of routes
         assert len(rules1) == len(rules2), "Route count should be consistent"
         
-        print(f"✓ List custom routes consistency check passed")
+        self.log(f"✓ List custom routes consistency check passed")
 
 def main():
     """Run list-custom-routes operation tests"""
     test = TestListCustomRoutesOperation()
     
-    tests = [
-        test.test_list_custom_routes_empty,
-        test.test_list_custom_routes_with_data,
-        test.test_list_custom_routes_with_parameters,
-        test.test_list_custom_routes_structure,
-        test.test_list_custom_routes_consistency
-    ]
+    tests = test.discover_tests()
     
-    passed = 0
+    # Serial: the consistency test compares route counts that concurrent adds would change
+    passed = sum(test.run_tests(tests, max_workers=1))
     total = len(tests)
-    
-    for test_func in tests:
-        if test.run_test(test_func):
-            passed += 1
             
     print(f"\n📊 List Custom Routes Operation Tests Results: {passed}/{total} passed")
     return passed == total
@@ -6,25 +6,17 @@ Usage: python test_list_operation.py [vpn_type]
 """
 
 import sys
-import os
-import json
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from base_rpc_test import BaseRPCTest
-
-def print_response(response):
-    """Pretty print the RPC response"""
-    print(f"Response:\n{json.dumps(response, indent=2)}")
+from base_rpc_test import shared_client, print_response
 
 def test_list(vpn_type=None):
     """Test listing VPN instances via RPC"""
-    test = BaseRPCTest()
-    
+    test = shared_client()
+    if test is None:
+        print("✗ Test setup failed")
+        return False
+        
     try:
-        if not test.setup():
-            print("✗ Test setup failed")
-            return False
-            
         if vpn_type:
             print(f"Testing: List VPN Instances of type '{vpn_type}'")
             params = {"vpn_type": vpn_type}
@@ -35,9 +27,13 @@ def test_list(vpn_type=None):
         response = test.send_rpc_request("list", params)
         print_response(response)
         
-        # Basic validation
+        # Basic validation; the server counts the instances its vpn_type filter kept
         if 'result' in response and response['result'].get('success'):
-            print("✓ List operation completed successfully")
+            result = response['result']
+            if result.get('count') != len(result.get('instances', [])):
+                print(f"✗ Server count {result.get('count')} does not match the listed instances")
+                return False
+            print(f"✓ List operation completed successfully: {result['count']} instances")
             return True
         else:
             print("✗ List operation failed")
@@ -46,8 +42,6 @@ def test_list(vpn_type=None):
     except Exception as e:
         print(f"✗ Test failed: {e}")
         return False
-    finally:
-        test.teardown()
 
 if __name__ == "__main__":
     vpn_type = sys.argv[1] if len(sys.argv) > 1 else None
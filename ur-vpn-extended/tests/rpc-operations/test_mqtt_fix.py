@@ -4,8 +4,6 @@ Quick test to verify MQTT client fix works
 """
 
 import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from base_rpc_test import BaseRPCTest
 
@@ -6,39 +6,17 @@ Usage: python test_parse_operation.py <config_file_path>
 """
 
 import sys
-import os
-import json
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from base_rpc_test import BaseRPCTest
-
-def print_response(response):
-    """Pretty print the RPC response"""
-    print(f"Response:\n{json.dumps(response, indent=2)}")
-
-def read_config_file(filepath):
-    """Read VPN configuration from file"""
-    if not os.path.exists(filepath):
-        print(f"Error: File '{filepath}' not found")
-        sys.exit(1)
-    
-    try:
-        with open(filepath, 'r') as f:
-            content = f.read()
-        return content
-    except Exception as e:
-        print(f"Error reading file: {e}")
-        sys.exit(1)
+from base_rpc_test import shared_client, print_response, read_config_file
 
 def test_parse(config_file):
     """Test parsing VPN configuration via RPC"""
-    test = BaseRPCTest()
-    
+    test = shared_client()
+    if test is None:
+        print("✗ Test setup failed")
+        return False
+        
     try:
-        if not test.setup():
-            print("✗ Test setup failed")
-            return False
-            
         print(f"Testing: Parse VPN Configuration from '{config_file}'")
         
         config_content = read_config_file(config_file)
@@ -61,8 +39,6 @@ def test_parse(config_file):
     except Exception as e:
         print(f"✗ Test failed: {e}")
         return False
-    finally:
-        test.teardown()
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
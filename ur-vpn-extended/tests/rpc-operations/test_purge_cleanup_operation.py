@@ -2,29 +2,28 @@
 """
 Test RPC operation: purge-cleanup
 Comprehensive cleanup of all VPN instances, data, routes, and configurations
-Usage: python test_purge_cleanup_operation.py [--confirm]
+Usage: python test_purge_cleanup_operation.py [--confirm [--yes]]
 """
 
-import sys
+import io
 import os
-import json
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import re
+import sys
+import threading
 
-from base_rpc_test import BaseRPCTest
+from base_rpc_test import shared_client, print_response
 
-def print_response(response):
-    """Pretty print the RPC response"""
-    print(f"Response:\n{json.dumps(response, indent=2)}")
+# Server's refusal of an unconfirmed purge ("Confirmation required. Set 'confirm': true ...")
+_CONFIRMATION_REQUIRED = re.compile(r"confirmation required", re.IGNORECASE)
 
 def test_purge_cleanup(confirm=False):
     """Test comprehensive purge cleanup via RPC"""
-    test = BaseRPCTest()
-    
+    test = shared_client()
+    if test is None:
+        print("✗ Test setup failed")
+        return False
+        
     try:
-        if not test.setup():
-            print("✗ Test setup failed")
-            return False
-            
         if confirm:
             print("Testing: Purge Cleanup (WITH CONFIRMATION - DESTRUCTIVE)")
             print("⚠️  WARNING: This will remove ALL VPN instances, configurations, and data!")
@@ -44,7 +43,7 @@ def test_purge_cleanup(confirm=False):
             
             if not confirm:
                 # Should fail without confirmation
-                if not result.get('success') and 'confirmation required' in result.get('error', '').lower():
+                if not result.get('success') and _CONFIRMATION_REQUIRED.search(result.get('error', '')):
                     print("✓ Safety check passed - confirmation required as expected")
                     return True
                 else:
@@ -92,15 +91,14 @@ def test_purge_cleanup(confirm=False):
     except Exception as e:
         print(f"✗ Test failed: {e}")
         return False
-    finally:
-        test.teardown()
 
 def print_usage():
     """Print usage information"""
-    print("Usage: python test_purge_cleanup_operation.py [--confirm]")
+    print("Usage: python test_purge_cleanup_operation.py [--confirm [--yes]]")
     print("")
     print("Options:")
     print("  --confirm    Execute destructive purge cleanup (removes all VPN data)")
+    print("  --yes        Skip the interactive 'PURGE' prompt (implied when CI is 1, true or yes)")
     print("")
     print("Examples:")
     print("  # Test safety check (without cleanup)")
@@ -118,15 +116,19 @@ def print_usage():
 
 if __name__ == "__main__":
     confirm = False
+    # Only an explicit truthy CI value stands in for --yes; CI=false or CI=0 still prompts
+    assume_yes = os.environ.get("CI", "").strip().lower() in ("1", "true", "yes")
     
-    if len(sys.argv) > 1:
-        if sys.argv[1] == "--confirm":
+    for arg in sys.argv[1:]:
+        if arg == "--confirm":
             confirm = True
-        elif sys.argv[1] in ["-h", "--help", "help"]:
+        elif arg == "--yes":
+            assume_yes = True
+        elif arg in ["-h", "--help", "help"]:
             print_usage()
             sys.exit(0)
         else:
-            print(f"Unknown option: {sys.argv[1]}")
+            print(f"Unknown option: {arg}")
             print_usage()
             sys.exit(1)
     
@@ -137,15 +139,22 @@ if __name__ == "__main__":
         print("This will remove ALL VPN data from the system!")
         print("=" * 60)
         
-        # Ask for additional confirmation
-        try:
-            response = input("Type 'PURGE' to confirm: ").strip()
-            if response != "PURGE":
-                print("Operation cancelled")
+        # Ask for additional confirmation, connecting to the broker while the user types;
+        # the connection output is held back so it cannot land on the prompt line
+        if not assume_yes:
+            connect_output = io.StringIO()
+            connector = threading.Thread(target=shared_client, args=(connect_output,), daemon=True)
+            connector.start()
+            try:
+                response = input("Type 'PURGE' to confirm: ").strip()
+                if response != "PURGE":
+                    print("Operation cancelled")
+                    sys.exit(0)
+            except KeyboardInterrupt:
+                print("\nOperation cancelled")
                 sys.exit(0)
-        except KeyboardInterrupt:
-            print("\nOperation cancelled")
-            sys.exit(0)
+            connector.join()
+            sys.stdout.write(connect_output.getvalue())
     
     success = test_purge_cleanup(confirm)
     
@@ -1,59 +1,48 @@
 #!/usr/bin/env python3
 """
 Test RPC operation: start
-Start a VPN instance
-Usage: python test_start_operation.py <instance_name>
+Start one or more VPN instances
+Usage: python test_start_operation.py <instance_name> [instance_name ...]
 """
 
 import sys
-import os
-import json
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from base_rpc_test import BaseRPCTest
+from base_rpc_test import shared_client, print_response
 
-def print_response(response):
-    """Pretty print the RPC response"""
-    print(f"Response:\n{json.dumps(response, indent=2)}")
-
-def test_start(instance_name):
-    """Test starting a VPN instance via RPC"""
-    test = BaseRPCTest()
-    
+def test_start(*instance_names):
+    """Test starting VPN instances via RPC; several are sent as one JSON-RPC batch"""
+    test = shared_client()
+    if test is None:
+        print("✗ Test setup failed")
+        return False
+        
     try:
-        if not test.setup():
-            print("✗ Test setup failed")
-            return False
+        if len(instance_names) == 1:
+            print(f"Testing: Start VPN Instance '{instance_names[0]}'")
+            responses = [test.send_rpc_request("start", {"instance_name": instance_names[0]})]
+        else:
+            print(f"Testing: Start {len(instance_names)} VPN Instances in one batch")
+            responses = test.send_rpc_batch([("start", {"instance_name": name}) for name in instance_names])
             
-        print(f"Testing: Start VPN Instance '{instance_name}'")
-        
-        params = {
-            "instance_name": instance_name
-        }
-        
-        response = test.send_rpc_request("start", params)
-        print_response(response)
-        
         # Basic validation
-        if 'result' in response and response['result'].get('success'):
-            print("✓ Start operation completed successfully")
-            return True
-        else:
-            print("✗ Start operation failed")
-            return False
+        succeeded = True
+        for instance_name, response in zip(instance_names, responses):
+            print_response(response)
+            if 'result' in response and response['result'].get('success'):
+                print(f"✓ Start operation completed successfully for '{instance_name}'")
+            else:
+                print(f"✗ Start operation failed for '{instance_name}'")
+                succeeded = False
+        return succeeded
             
     except Exception as e:
         print(f"✗ Test failed: {e}")
         return False
-    finally:
-        test.teardown()
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: python test_start_operation.py <instance_name>")
+        print("Usage: python test_start_operation.py <instance_name> [instance_name ...]")
         sys.exit(1)
     
-    instance_name = sys.argv[1]
-    
-    success = test_start(instance_name)
+    success = test_start(*sys.argv[1:])
     sys.exit(0 if success else 1)
@@ -6,30 +6,20 @@ Usage: python test_stats_operation.py
 """
 
 import sys
-import os
-import json
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from base_rpc_test import BaseRPCTest
-
-def print_response(response):
-    """Pretty print the RPC response"""
-    print(f"Response:\n{json.dumps(response, indent=2)}")
+from base_rpc_test import shared_client, print_response
 
 def test_stats():
     """Test getting aggregated VPN statistics via RPC"""
-    test = BaseRPCTest()
-    
+    test = shared_client()
+    if test is None:
+        print("✗ Test setup failed")
+        return False
+        
     try:
-        if not test.setup():
-            print("✗ Test setup failed")
-            return False
-            
         print("Testing: Get Aggregated VPN Statistics")
         
-        params = {}
-        
-        response = test.send_rpc_request("stats", params)
+        response = test.send_stats()
         print_response(response)
         
         # Basic validation
@@ -43,8 +33,6 @@ def test_stats():
     except Exception as e:
         print(f"✗ Test failed: {e}")
         return False
-    finally:
-        test.teardown()
 
 if __name__ == "__main__":
     success = test_stats()
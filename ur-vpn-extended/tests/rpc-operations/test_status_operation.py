@@ -6,33 +6,24 @@ Usage: python test_status_operation.py [instance_name]
 """
 
 import sys
-import os
-import json
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from base_rpc_test import BaseRPCTest
-
-def print_response(response):
-    """Pretty print the RPC response"""
-    print(f"Response:\n{json.dumps(response, indent=2)}")
+from base_rpc_test import shared_client, print_response
 
 def test_status(instance_name=None):
     """Test getting VPN instance status via RPC"""
-    test = BaseRPCTest()
-    
+    test = shared_client()
+    if test is None:
+        print("✗ Test setup failed")
+        return False
+        
     try:
-        if not test.setup():
-            print("✗ Test setup failed")
-            return False
-            
         if instance_name:
             print(f"Testing: Get Status of VPN Instance '{instance_name}'")
-            params = {"instance_name": instance_name}
         else:
             print("Testing: Get Status of All VPN Instances")
-            params = {}
+            instance_name = None
         
-        response = test.send_rpc_request("status", params)
+        response = test.send_status(instance_name)
         print_response(response)
         
         # Basic validation
@@ -46,8 +37,6 @@ def test_status(instance_name=None):
     except Exception as e:
         print(f"✗ Test failed: {e}")
         return False
-    finally:
-        test.teardown()
 
 if __name__ == "__main__":
     instance_name = sys.argv[1] if len(sys.argv) > 1 else None
@@ -6,32 +6,20 @@ Usage: python test_stop_operation.py <instance_name>
 """
 
 import sys
-import os
-import json
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from base_rpc_test import BaseRPCTest
-
-def print_response(response):
-    """Pretty print the RPC response"""
-    print(f"Response:\n{json.dumps(response, indent=2)}")
+from base_rpc_test import shared_client, print_response
 
 def test_stop(instance_name):
     """Test stopping a VPN instance via RPC"""
-    test = BaseRPCTest()
-    
+    test = shared_client()
+    if test is None:
+        print("✗ Test setup failed")
+        return False
+        
     try:
-        if not test.setup():
-            print("✗ Test setup failed")
-            return False
-            
         print(f"Testing: Stop VPN Instance '{instance_name}'")
         
-        params = {
-            "instance_name": instance_name
-        }
-        
-        response = test.send_rpc_request("stop", params)
+        response = test.send_stop(instance_name)
         print_response(response)
         
         # Basic validation
@@ -45,8 +33,6 @@ def test_stop(instance_name):
     except Exception as e:
         print(f"✗ Test failed: {e}")
         return False
-    finally:
-        test.teardown()
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
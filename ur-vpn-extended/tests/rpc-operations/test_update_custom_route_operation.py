@@ -4,47 +4,71 @@ Test RPC operation: update-custom-route
 Update an existing custom routing rule
 """
 
-import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import sys
+
+from base_rpc_test import BaseRPCTest, encode_request, ErrorCode, MISSING_ID
 
-from base_rpc_test import BaseRPCTest
+# Fixed negative-test requests, encoded once at import
+_UPDATE_MISSING_ID_REQUEST = encode_request("update-custom-route", {
+    "name": "Route without ID",
+    "destination": "192.168.1.0/24"
+})
+
+# Route fixtures, built once at import from the fields they share; ids carry
+# the process id so concurrent runs never update each other's routes
+_BASE_ROUTE = {
+    "vpn_instance": "test_instance",
+    "destination": "192.168.1.0/24"
+}
+_UPDATE_TEST_ROUTE = {
+    **_BASE_ROUTE,
+    "id": f"update_test_route_{os.getpid()}",
+    "name": "Original Route",
+    "priority": 100,
+    "enabled": True
+}
+_PARTIAL_UPDATE_ROUTE = {
+    **_BASE_ROUTE,
+    "id": f"partial_update_route_{os.getpid()}",
+    "name": "Original Name",
+    "priority": 100,
+    "enabled": True,
+    "description": "Original description"
+}
+_FULL_UPDATE_ROUTE = {
+    **_BASE_ROUTE,
+    "id": f"full_update_route_{os.getpid()}",
+    "name": "Original"
+}
 
 class TestUpdateCustomRouteOperation(BaseRPCTest):
     """Test update-custom-route operation"""
     
+    __slots__ = ()
+    
     def test_update_custom_route(self):
         """Test updating a custom routing rule"""
-        # Add a route first
-        route_data = {
-            "id": "update_test_route",
-            "name": "Original Route",
-            "vpn_instance": "test_instance",
-            "destination": "192.168.1.0/24",
-            "priority": 100,
-            "enabled": True
-        }
-        
-        self.send_rpc_request("add-custom-route", route_data)
-        
-        # Update the route
+        # Update the route, in the same batch as the add it depends on
         update_data = {
-            "id": "update_test_route",
+            "id": _UPDATE_TEST_ROUTE["id"],
             "name": "Updated Route",
             "priority": 300,
             "enabled": False,
             "description": "Updated description"
         }
         
-        response = self.send_rpc_request("update-custom-route", update_data)
-        
-        self.assert_success(response)
+        self.add_cleanup("delete-custom-route", {"id": _UPDATE_TEST_ROUTE["id"]})
+        added, response = self.send_rpc_dependent_batch([
+            ("add-custom-route", _UPDATE_TEST_ROUTE, None),
+            ("update-custom-route", update_data, 0)
+        ])
+        self.assert_ok(added)
         
-        result = response['result']
-        assert result['success'] == True
+        result = self.assert_ok(response)
         assert "updated successfully" in result['message']
         
-        print(f"✓ Custom route updated: {result['message']}")
+        self.log(f"✓ Custom route updated: {result['message']}")
         
     def test_update_nonexistent_custom_route(self):
         """Test updating a non-existent custom route"""
@@ -53,72 +77,45 @@ class TestUpdateCustomRouteOperation(BaseRPCTest):
             "name": "Non-existent Route"
         })
         
-        self.assert_success(response, expected_success=False)
+        result = self.assert_ok(response, expected=False)
         
-        result = response['result']
-        assert result['success'] == False
-        
-        print(f"✓ Non-existent route update correctly rejected: {result['error']}")
+        self.log(f"✓ Non-existent route update correctly rejected: {result['error']}")
         
     def test_update_missing_id(self):
         """Test updating custom route without id"""
-        response = self.send_rpc_request("update-custom-route", {
-            "name": "Route without ID",
-            "destination": "192.168.1.0/24"
-        })
-        
-        self.assert_success(response, expected_success=False)
+        response = self.send_encoded(_UPDATE_MISSING_ID_REQUEST)
         
-        result = response['result']
-        assert result['success'] == False
-        assert "Missing 'id' field" in result['error']
+        result = self.assert_ok(response, expected=False)
+        assert result['code'] == ErrorCode.MISSING_PARAM
+        assert result['error'].startswith(MISSING_ID)
         
-        print(f"✓ Missing id correctly rejected: {result['error']}")
+        self.log(f"✓ Missing id correctly rejected: {result['error']}")
         
     def test_update_partial_fields(self):
         """Test updating only some fields of a custom route"""
-        # Add a route first
-        original_route = {
-            "id": "partial_update_route",
-            "name": "Original Name",
-            "vpn_instance": "test_instance",
-            "destination": "192.168.1.0/24",
-            "priority": 100,
-            "enabled": True,
-            "description": "Original description"
-        }
-        
-        self.send_rpc_request("add-custom-route", original_route)
-        
-        # Update only priority and enabled status
+        # Update only priority and enabled status, batched behind the add
         update_data = {
-            "id": "partial_update_route",
+            "id": _PARTIAL_UPDATE_ROUTE["id"],
             "priority": 500,
             "enabled": False
         }
         
-        response = self.send_rpc_request("update-custom-route", update_data)
+        self.add_cleanup("delete-custom-route", {"id": _PARTIAL_UPDATE_ROUTE["id"]})
+        added, response = self.send_rpc_dependent_batch([
+            ("add-custom-route", _PARTIAL_UPDATE_ROUTE, None),
+            ("update-custom-route", update_data, 0)
+        ])
+        self.assert_ok(added)
         
-        self.assert_success(response)
+        result = self.assert_ok(response)
         
-        result = response['result']
-        assert result['success'] == True
-        
-        print(f"✓ Partial route update successful: {result['message']}")
+        self.log(f"✓ Partial route update successful: {result['message']}")
         
     def test_update_all_fields(self):
         """Test updating all fields of a custom route"""
-        # Add a route first
-        self.send_rpc_request("add-custom-route", {
-            "id": "full_update_route",
-            "name": "Original",
-            "vpn_instance": "test_instance",
-            "destination": "192.168.1.0/24"
-        })
-        
-        # Update with all new values
+        # Update with all new values, batched behind the add
         update_data = {
-            "id": "full_update_route",
+            "id": _FULL_UPDATE_ROUTE["id"],
             "name": "Completely Updated Route",
             "vpn_instance": "updated_instance",
             "vpn_profile": "new_profile",
@@ -137,33 +134,25 @@ class TestUpdateCustomRouteOperation(BaseRPCTest):
             "user_modified": True
         }
         
-        response = self.send_rpc_request("update-custom-route", update_data)
+        self.add_cleanup("delete-custom-route", {"id": _FULL_UPDATE_ROUTE["id"]})
+        added, response = self.send_rpc_dependent_batch([
+            ("add-custom-route", _FULL_UPDATE_ROUTE, None),
+            ("update-custom-route", update_data, 0)
+        ])
+        self.assert_ok(added)
         
-        self.assert_success(response)
+        result = self.assert_ok(response)
         
-        result = response['result']
-        assert result['success'] == True
-        
-        print(f"✓ Full route update successful: {result['message']}")
+        self.log(f"✓ Full route update successful: {result['message']}")
 
 def main():
     """Run update-custom-route operation tests"""
     test = TestUpdateCustomRouteOperation()
     
-    tests = [
-        test.test_update_custom_route,
-        test.test_update_nonexistent_custom_route,
-        test.test_update_missing_id,
-        test.test_update_partial_fields,
-        test.test_update_all_fields
-    ]
+    tests = test.discover_tests()
     
-    passed = 0
+    passed = sum(test.run_tests(tests))
     total = len(tests)
-    
-    for test_func in tests:
-        if test.run_test(test_func):
-            passed += 1
             
     print(f"\n📊 Update Custom Route Operation Tests Results: {passed}/{total} passed")
     return passed == total
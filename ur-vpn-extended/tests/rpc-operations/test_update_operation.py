@@ -3,42 +3,21 @@
 Test RPC operation: update
 Update an existing VPN instance configuration
 Usage: python test_update_operation.py <instance_name> <config_file_path>
+       python test_update_operation.py --persistent < commands.jsonl
 """
 
 import sys
-import os
-import json
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from base_rpc_test import BaseRPCTest
-
-def print_response(response):
-    """Pretty print the RPC response"""
-    print(f"Response:\n{json.dumps(response, indent=2)}")
-
-def read_config_file(filepath):
-    """Read VPN configuration from file"""
-    if not os.path.exists(filepath):
-        print(f"Error: File '{filepath}' not found")
-        sys.exit(1)
-    
-    try:
-        with open(filepath, 'r') as f:
-            content = f.read()
-        return content
-    except Exception as e:
-        print(f"Error reading file: {e}")
-        sys.exit(1)
+from base_rpc_test import shared_client, print_response, read_config_file, load_config_file, json_dumps, json_loads
 
 def test_update(instance_name, config_file):
     """Test updating a VPN instance via RPC"""
-    test = BaseRPCTest()
-    
+    test = shared_client()
+    if test is None:
+        print("✗ Test setup failed")
+        return False
+        
     try:
-        if not test.setup():
-            print("✗ Test setup failed")
-            return False
-            
         print(f"Testing: Update VPN Instance '{instance_name}'")
         
         config_content = read_config_file(config_file)
@@ -62,12 +41,43 @@ def test_update(instance_name, config_file):
     except Exception as e:
         print(f"✗ Test failed: {e}")
         return False
-    finally:
-        test.teardown()
+
+def serve_persistent():
+    """Run one update per stdin line over a single connection, writing each response as one JSON line.
+
+    Each line is {"instance_name": ..., "config_file": ...}. The config file
+    is read afresh for every command, so edits between updates are sent; a
+    command that fails, including on an unreadable file, gets an error line.
+    """
+    # Progress logging would interleave with the response lines
+    test = shared_client(verbose=False)
+    if test is None:
+        print("✗ Test setup failed", file=sys.stderr)
+        return False
+        
+    out = sys.stdout.buffer
+    for line in sys.stdin.buffer:
+        if not line.strip():
+            continue
+        try:
+            command = json_loads(line)
+            response = test.send_rpc_request("update", {
+                "instance_name": command["instance_name"],
+                "config_content": load_config_file(command["config_file"])
+            })
+        except Exception as e:
+            response = {"error": str(e)}
+        out.write(json_dumps(response) + b"\n")
+        out.flush()
+    return True
 
 if __name__ == "__main__":
+    if sys.argv[1:] == ["--persistent"]:
+        sys.exit(0 if serve_persistent() else 1)
+        
     if len(sys.argv) < 3:
         print("Usage: python test_update_operation.py <instance_name> <config_file_path>")
+        print("       python test_update_operation.py --persistent < commands.jsonl")
         sys.exit(1)
     
     instance_name = sys.argv[1]
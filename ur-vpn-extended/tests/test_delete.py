@@ -5,35 +5,15 @@ Test suite for VPN Instance Manager HTTP API - Delete Operation
 Usage: python test_delete.py <instance_name> [vpn_type]
 """
 
-import requests
-import json
 import sys
 
-# Configuration
-API_BASE_URL = "http://0.0.0.0:5000"
-API_ENDPOINT = f"{API_BASE_URL}/api/operations/"
-
-def print_response(response):
-    """Pretty print the API response"""
-    print(f"Status Code: {response.status_code}")
-    try:
-        print(f"Response:\n{json.dumps(response.json(), indent=2)}")
-    except:
-        print(f"Response: {response.text}")
+from http_common import post_operation, print_response
 
 def test_delete(instance_name, vpn_type=""):
     """Test deleting a VPN instance"""
     print(f"Testing: Delete VPN Instance '{instance_name}'")
     
-    payload = {
-        "operation_type": "delete",
-        "instance_name": instance_name
-    }
-    
-    if vpn_type:
-        payload["vpn_type"] = vpn_type
-    
-    response = requests.post(API_ENDPOINT, json=payload)
+    response = post_operation("delete", instance_name=instance_name, vpn_type=vpn_type or None)
     print_response(response)
     return response.status_code == 200
 
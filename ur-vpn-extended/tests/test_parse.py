@@ -5,36 +5,9 @@ Test suite for VPN Instance Manager HTTP API - Parse Operation
 Usage: python test_parse.py <config_file_path>
 """
 
-import requests
-import json
 import sys
-import os
 
-# Configuration
-API_BASE_URL = "http://0.0.0.0:5000"
-API_ENDPOINT = f"{API_BASE_URL}/api/operations/"
-
-def print_response(response):
-    """Pretty print the API response"""
-    print(f"Status Code: {response.status_code}")
-    try:
-        print(f"Response:\n{json.dumps(response.json(), indent=2)}")
-    except:
-        print(f"Response: {response.text}")
-
-def read_config_file(filepath):
-    """Read VPN configuration from file"""
-    if not os.path.exists(filepath):
-        print(f"Error: File '{filepath}' not found")
-        sys.exit(1)
-    
-    try:
-        with open(filepath, 'r') as f:
-            content = f.read()
-        return content
-    except Exception as e:
-        print(f"Error reading file: {e}")
-        sys.exit(1)
+from http_common import post_operation, print_response, read_config_file
 
 def test_parse(config_file):
     """Test parsing a VPN configuration"""
@@ -42,12 +15,7 @@ def test_parse(config_file):
     
     config_content = read_config_file(config_file)
     
-    payload = {
-        "operation_type": "parse",
-        "config_content": config_content
-    }
-    
-    response = requests.post(API_ENDPOINT, json=payload)
+    response = post_operation("parse", config_content=config_content)
     print_response(response)
     return response.status_code == 200
 
@@ -5,32 +5,15 @@ Test suite for VPN Instance Manager HTTP API - Start Operation
 Usage: python test_start.py <instance_name>
 """
 
-import requests
-import json
 import sys
 
-# Configuration
-API_BASE_URL = "http://0.0.0.0:8080"
-API_ENDPOINT = f"{API_BASE_URL}/api/operations/"
-
-def print_response(response):
-    """Pretty print the API response"""
-    print(f"Status Code: {response.status_code}")
-    try:
-        print(f"Response:\n{json.dumps(response.json(), indent=2)}")
-    except:
-        print(f"Response: {response.text}")
+from http_common import post_operation, print_response
 
 def test_start(instance_name):
     """Test starting a VPN instance"""
     print(f"Testing: Start VPN Instance '{instance_name}'")
     
-    payload = {
-        "operation_type": "start",
-        "instance_name": instance_name
-    }
-    
-    response = requests.post(API_ENDPOINT, json=payload)
+    response = post_operation("start", instance_name=instance_name)
     print_response(response)
     return response.status_code == 200
 
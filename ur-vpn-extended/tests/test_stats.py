@@ -5,31 +5,18 @@ Test suite for VPN Instance Manager HTTP API - Stats Operation
 Usage: python test_stats.py
 """
 
-import requests
-import json
 import sys
 
-# Configuration
-API_BASE_URL = "http://0.0.0.0:8080"
-API_ENDPOINT = f"{API_BASE_URL}/api/operations/"
+from http_common import encode_payload, post_body, print_response
 
-def print_response(response):
-    """Pretty print the API response"""
-    print(f"Status Code: {response.status_code}")
-    try:
-        print(f"Response:\n{json.dumps(response.json(), indent=2)}")
-    except:
-        print(f"Response: {response.text}")
+# The request body never changes, so it is encoded once at import
+_STATS_BODY = encode_payload({"operation_type": "stats"})
 
 def test_stats():
     """Test getting aggregated statistics"""
     print("Testing: Get Aggregated Statistics")
     
-    payload = {
-        "operation_type": "stats"
-    }
-    
-    response = requests.post(API_ENDPOINT, json=payload)
+    response = post_body(_STATS_BODY)
     print_response(response)
     return response.status_code == 200
 